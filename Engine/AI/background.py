@@ -0,0 +1,101 @@
+"""
+Run a search on a worker thread.
+
+The caller starts a search and keeps going (e.g. pumping a UI event loop);
+progress and the final move arrive as messages on a queue that it polls:
+
+    search = BackgroundSearch(minmax)
+    search.start(position, legal_moves)
+    ...
+    for kind, value in search.poll():
+        if kind == RESULT:
+            play(value)
+"""
+import queue
+import threading
+
+# Message kinds posted to the queue
+PROGRESS = "progress"
+RESULT = "result"
+
+
+class BackgroundSearch:
+    """Runs MinMax searches on a daemon thread and posts their results to a queue."""
+    def __init__(self, searcher):
+        """
+        Initialize the background search.
+
+        Args:
+            searcher (MinMax): The search to run. Its on_iteration callback is
+                taken over to post progress messages.
+        """
+        self.searcher = searcher
+        self.searcher.on_iteration = self.report_iteration
+        self.messages = queue.Queue()
+        self.thread = None
+
+    def start(self, position, legal_moves, time_limit=None, node_limit=None, ponder=False):
+        """
+        Start searching, cancelling any search still running.
+
+        Args:
+            position (Bitboard): The root position; owned by the search until it finishes.
+            legal_moves (list): The root moves to choose from.
+            time_limit (float): Seconds to search; defaults to the searcher's.
+            node_limit (int): Nodes to search; defaults to the searcher's.
+            ponder (bool): Search on the opponent's time: the limits only
+                start counting at ponder_hit().
+        """
+        self.cancel()
+        self.searcher.pondering = ponder
+        self.thread = threading.Thread(target=self.run,
+                                       args=(position, legal_moves, time_limit, node_limit),
+                                       daemon=True)
+        self.thread.start()
+
+    def run(self, position, legal_moves, time_limit, node_limit):
+        """Search and post the best move (runs on the worker thread)."""
+        move = self.searcher.search(position, legal_moves, time_limit, node_limit)
+        self.messages.put((RESULT, move))
+
+    def report_iteration(self, depth, move, score, nodes, seconds, pv):
+        """Post a completed iteration (runs on the worker thread)."""
+        self.messages.put((PROGRESS, (depth, move, score, nodes, seconds, pv)))
+
+    def running(self):
+        """Whether a search is still in progress."""
+        return self.thread is not None and self.thread.is_alive()
+
+    def ponder_hit(self):
+        """The opponent played the pondered move: let the search finish on the clock."""
+        self.searcher.ponder_hit()
+
+    def stop(self):
+        """Ask the search to finish now; its best move so far is still posted."""
+        thread = self.thread
+        while thread is not None and thread.is_alive():
+            # Repeat in case the search had not started (and reset its flag) yet
+            self.searcher.stop()
+            thread.join(0.01)
+
+    def cancel(self):
+        """Stop the search and discard everything it posted."""
+        self.stop()
+        self.thread = None
+        self.poll()
+
+    def poll(self):
+        """
+        Take the messages posted so far without waiting.
+
+        Returns:
+            list: (kind, value) pairs in the order posted. PROGRESS values
+            are (depth, move, score, nodes, seconds, pv); the RESULT value is
+            the best encoded move.
+        """
+        messages = []
+        while True:
+            try:
+                messages.append(self.messages.get_nowait())
+            except queue.Empty:
+                return messages
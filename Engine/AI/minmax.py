@@ -1,148 +1,685 @@
 import random
+import threading
+import time
+from Engine.bitboard import COLOR_INDEX, WHITE, KING, QUEEN, square_xy
+from Engine.movegen import generate_captures, position_status
+from Engine.move import move_from, move_to, move_promotion, move_to_uci
+from Engine.AI.transposition import *
+from Engine.AI.ordering import MoveOrderer, MAX_PLY
+from Engine.AI.see import capture_gain, static_exchange
+from Engine.AI.parallel import ParallelSearch
+from Engine.log import get_logger, is_enabled, TRACE, DEBUG, INFO
+
+log = get_logger("search")
+
+# Score of a checkmate, far outside anything the evaluator returns
+MATE_SCORE = 100000
+# Scores beyond this are mates and are stored in the table relative to the node
+MATE_BOUND = MATE_SCORE - 1000
+# Quiescence skips captures that cannot lift the score to alpha even with this much to spare
+DELTA_MARGIN = 200
+
+
+def score_to_tt(score, ply):
+    """Convert a root-relative mate score into a node-relative one for storage."""
+    if score > MATE_BOUND:
+        return score + ply
+    if score < -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def score_from_tt(score, ply):
+    """Convert a stored node-relative mate score back to root-relative."""
+    if score > MATE_BOUND:
+        return score - ply
+    if score < -MATE_BOUND:
+        return score + ply
+    return score
+
 
 class MinMax:
-    def __init__(self, game, board, depth):
+    def __init__(self, game, board, depth, hash_mb=DEFAULT_SIZE_MB, time_limit=None, node_limit=None,
+                 randomize=True, workers=1, book=None):
+        """
+        Initialize the search.
+
+        Args:
+            game (Game): The game being played.
+            board (Chessboard): The game's board.
+            depth (int): Maximum search depth in plies.
+            hash_mb (float): Transposition table budget in megabytes. The
+                table is kept between searches for the whole game.
+            time_limit (float): Seconds allowed per move, or None for no limit.
+            node_limit (int): Nodes allowed per move, or None for no limit.
+            randomize (bool): Shuffle root moves so equally scored moves are
+                picked at random.
+            workers (int): Processes to split the root moves across; 1
+                searches in this process.
+            book (OpeningBook): Opening book played from before searching, or None.
+        """
         self.game = game
         self.ChessBoard = board
         self.depth = depth
+        self.tt = TranspositionTable(hash_mb)
+        # Check state and legal moves of the searched positions (see movegen.position_status).
+        # The search thread has its own, so it never writes the game's cache under the UI
+        self.status_cache = {}
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.randomize = randomize
+        self.orderer = MoveOrderer()
+        self.root_ply = 0
+        self.root_best = None
+        self.nodes = 0
+        # Beta cutoffs in the main search, and how many came from the first move searched
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.stopped = False
+        self.deadline = float('inf')
+        self.max_nodes = float('inf')
+        self.completed_depth = 0
+        self.pv = []
+        # (depth, move, score, pv) of every iteration completed by the last search
+        self.iterations = []
+        # Per-node tracing, looked up once per search so it costs nothing when off
+        self.tracing = False
+        # Root move and iteration messages, looked up the same way
+        self.debugging = False
+        self.reporting = False
+        # Called as on_iteration(depth, move, score, nodes, seconds, pv) after each iteration
+        self.on_iteration = None
+        self.workers = workers
+        self.parallel = ParallelSearch(workers, hash_mb) if workers > 1 else None
+        # Root bounds shared with the other workers when this search runs in a worker process
+        self.shared_bound = None
+        self.book = book
+        # Set before a search starts to search on the opponent's time: the time
+        # and node limits only apply from ponder_hit() on
+        self.pondering = False
+        self.move_time = None
+        self.move_nodes = None
+        self.budget_lock = threading.Lock()
+        # Notified when pondering ends or the search is stopped
+        self.ponder_done = threading.Condition(self.budget_lock)
 
-    def best_move(self, game_copy, depth, alpha, beta, maximizing_player):
+    def best_move(self, position, depth, alpha, beta, maximizing_player):
         """
-        Evaluate the best move using a copied game state.
-        
+        Evaluate a position with alpha-beta minimax.
+
+        Moves are made and unmade in place on the bitboard position, so the
+        search never touches the game's piece objects.
+
         Args:
-            game_copy (Game): The copied game state for simulation.
+            position (Bitboard): The position to search; restored on return.
             depth (int): Current search depth.
             alpha (float): Alpha value for pruning.
             beta (float): Beta value for pruning.
             maximizing_player (bool): Whether this is the maximizing player.
+
+        Returns:
+            int: The score of the position in centipawns, positive when white is better.
         """
-        gameStatus = game_copy.CheckWinningConditions()
-        if depth == 0 or gameStatus == "Stalemate" or gameStatus == "Checkmate":
-            eval = game_copy.ChessBoard.evaluate()
-            print(f"Terminal evaluation at depth {depth}: {eval}")
-            return eval
-            
+        self.nodes += 1
+        if self.nodes >= self.max_nodes or not self.nodes & 1023:
+            self.check_limits()
+        if self.stopped:
+            return 0
+
+        ply = len(position.history) - self.root_ply
+        key = position.hash
+        alpha_orig, beta_orig = alpha, beta
+        hash_move = 0
+        entry = self.tt.probe(key)
+        if entry is not None:
+            tt_depth, tt_score, bound, hash_move = entry
+            if tt_depth >= depth:
+                tt_score = score_from_tt(tt_score, ply)
+                if bound == EXACT:
+                    return tt_score
+                if bound == LOWER:
+                    alpha = max(alpha, tt_score)
+                else:
+                    beta = min(beta, tt_score)
+                if beta <= alpha:
+                    return tt_score
+
+        if depth <= 0:
+            if ply >= MAX_PLY or not position.in_check():
+                # Resolve pending captures before trusting the static evaluation
+                eval = self.quiescence(position, alpha, beta, maximizing_player)
+                if self.tracing:
+                    log.log(TRACE, "Terminal evaluation at depth %d: %s", depth, eval)
+                return eval
+            # Never stand pat while in check: look one more ply for an escape
+            depth = 1
+
+        inCheck, legal_moves = position_status(position)
+        # The list is shared with the status cache and reordered below
+        legal_moves = legal_moves.copy()
+        if not legal_moves:
+            # Checkmate (sooner is more decisive) or stalemate
+            if not inCheck:
+                return 0
+            return -MATE_SCORE + ply if maximizing_player else MATE_SCORE - ply
+
+        self.orderer.order(position, legal_moves, ply, hash_move)
+
+        best = 0
         if maximizing_player:
             max_eval = float('-inf')
-            inCheck = True if gameStatus == "Check" else False
-            side = "white" if game_copy.turn == 0 else "black"
-            legal_moves = game_copy.LegalMoves(side, inCheck)
-            
-            
-            
-            if not legal_moves:
-                return game_copy.ChessBoard.evaluate()
-
-            for piece, move in legal_moves:
-                # Make the move on the copied board
-                piece.move(move, False)  # Don't record captures in simulation
-                game_copy.turn = 1 - game_copy.turn
-                
+            for move in legal_moves:
+                position.make_move(move)
                 # Evaluate the position (next player is minimizing)
-                eval = self.best_move(game_copy, depth-1, alpha, beta, False)
+                eval = self.best_move(position, depth-1, alpha, beta, False)
+                position.unmake_move(move)
+                if self.stopped:
+                    return 0
 
-                game_copy.ChessBoard.moveStack.undoMove(False)
-                game_copy.turn = 1 - game_copy.turn
-                
-                max_eval = max(max_eval, eval)
+                if eval > max_eval:
+                    max_eval = eval
+                    best = move
                 alpha = max(alpha, max_eval)
                 if beta <= alpha:
+                    self.orderer.record_cutoff(position, move, ply, depth)
+                    self.cutoffs += 1
+                    if move == legal_moves[0]:
+                        self.first_move_cutoffs += 1
                     break
-            
-            print(f"Maximizing result at depth {depth}: {max_eval}")
+
+            self.store(key, depth, max_eval, alpha_orig, beta_orig, best, ply)
+            if self.tracing:
+                log.log(TRACE, "Maximizing result at depth %d: %s", depth, max_eval)
             return max_eval
-        
+
         else:
             min_eval = float('inf')
-            inCheck = True if gameStatus == "Check" else False
-            side = "white" if game_copy.turn == 0 else "black"
-            legal_moves = game_copy.LegalMoves(side, inCheck)
-            
-            
-            if not legal_moves:
-                return game_copy.ChessBoard.evaluate()
-
-            for piece, move in legal_moves:
-                # Make the move on the copied board
-                piece.move(move, False)  
-                game_copy.turn = 1 - game_copy.turn
-                
-                eval = self.best_move(game_copy, depth-1, alpha, beta, True)
-                
-                # Undo the move on the copied board
-                game_copy.ChessBoard.moveStack.undoMove(False)
-                game_copy.turn = 1 - game_copy.turn
-                
-                min_eval = min(min_eval, eval)
+            for move in legal_moves:
+                position.make_move(move)
+                eval = self.best_move(position, depth-1, alpha, beta, True)
+                position.unmake_move(move)
+                if self.stopped:
+                    return 0
+
+                if eval < min_eval:
+                    min_eval = eval
+                    best = move
                 beta = min(beta, min_eval)
                 if beta <= alpha:
+                    self.orderer.record_cutoff(position, move, ply, depth)
+                    self.cutoffs += 1
+                    if move == legal_moves[0]:
+                        self.first_move_cutoffs += 1
                     break
-            
-            print(f"Minimizing result at depth {depth}: {min_eval}")
+
+            self.store(key, depth, min_eval, alpha_orig, beta_orig, best, ply)
+            if self.tracing:
+                log.log(TRACE, "Minimizing result at depth %d: %s", depth, min_eval)
             return min_eval
-            
-    def find_best_move(self, side, inCheck):
-        # Create one copy of the board for the entire AI evaluation
-        board_copy = self.ChessBoard.copy()
-        game_copy = self.game.copy_for_simulation(board_copy)
 
-        bestScore = float('-inf') if side == "white" else float('inf')
-        bestMove = None
+    def quiescence(self, position, alpha, beta, maximizing_player):
+        """
+        Search only captures and promotions until the position is quiet.
+
+        The side to move may "stand pat" on the static evaluation instead of
+        capturing. Captures that cannot reach the window even when winning
+        the piece outright (delta pruning) or that lose material on the
+        static exchange are skipped.
+
+        Args:
+            position (Bitboard): The position to search; restored on return.
+            alpha (float): Alpha value for pruning.
+            beta (float): Beta value for pruning.
+            maximizing_player (bool): Whether this is the maximizing player.
+
+        Returns:
+            int: The score of the position in centipawns, positive when white is better.
+        """
+        self.nodes += 1
+        if self.nodes >= self.max_nodes or not self.nodes & 1023:
+            self.check_limits()
+        if self.stopped:
+            return 0
+
+        stand_pat = position.score
+        if maximizing_player:
+            if stand_pat >= beta:
+                return stand_pat
+            alpha = max(alpha, stand_pat)
+        else:
+            if stand_pat <= alpha:
+                return stand_pat
+            beta = min(beta, stand_pat)
+
+        moves = generate_captures(position)
+        self.orderer.order(position, moves, len(position.history) - self.root_ply)
+        us = position.side
+        best = stand_pat
+        for move in moves:
+            gain = capture_gain(position, move) + DELTA_MARGIN
+            if maximizing_player and stand_pat + gain <= alpha:
+                continue
+            if not maximizing_player and stand_pat - gain >= beta:
+                continue
+            if static_exchange(position, move) < 0:
+                continue
+
+            position.make_move(move)
+            king = position.pieces[us * 6 + KING]
+            if king and position.is_square_attacked(king.bit_length() - 1, us ^ 1):
+                position.unmake_move(move)
+                continue
+            score = self.quiescence(position, alpha, beta, not maximizing_player)
+            position.unmake_move(move)
+            if self.stopped:
+                return 0
+
+            if maximizing_player:
+                if score > best:
+                    best = score
+                alpha = max(alpha, best)
+            else:
+                if score < best:
+                    best = score
+                beta = min(beta, best)
+            if beta <= alpha:
+                break
+
+        return best
+
+    def store(self, key, depth, score, alpha, beta, move, ply):
+        """
+        Save a node's result in the transposition table.
+
+        Args:
+            key (int): The position's Zobrist key.
+            depth (int): The depth the node was searched to.
+            score (int): The score the node returned.
+            alpha (float): The alpha bound the node was entered with.
+            beta (float): The beta bound the node was entered with.
+            move (int): The best move found.
+            ply (int): Distance from the root, for mate score adjustment.
+        """
+        if score <= alpha:
+            bound = UPPER
+        elif score >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.tt.store(key, depth, score_to_tt(score, ply), bound, move)
 
-        # Get legal moves from the ORIGINAL game, not the copy
-        legal_moves = self.game.LegalMoves(side, inCheck)
+    def find_best_move(self, side, inCheck, time_limit=None, node_limit=None):
+        """
+        Search the current board and pick a move for one side.
+
+        Args:
+            side (str): The side to move ('white' or 'black').
+            inCheck (bool): Whether that side is in check (legal moves are
+                always filtered, so this is informational only).
+            time_limit (float): Seconds to search; defaults to self.time_limit.
+            node_limit (int): Nodes to search; defaults to self.node_limit.
 
+        Returns:
+            tuple: (piece, (x, y)) on the game board, or None if there are no legal moves.
+        """
+        position, legal_moves = self.root_position(side)
         if not legal_moves:
-            print("No legal moves available!")
+            log.warning("No legal moves available for %s", side)
             return None
 
-        print(f"AI ({side}) evaluating {len(legal_moves)} possible moves...")
+        log.info("AI (%s) evaluating %d possible moves", side, len(legal_moves))
 
-        # Make a copy of the list before shuffling to avoid modifying the original
-        legal_moves_copy = legal_moves.copy()
-        random.shuffle(legal_moves_copy)  
+        bestMove = self.search(position, legal_moves, time_limit, node_limit)
+        return self.to_board_move(bestMove)
 
-        for i, (piece, move) in enumerate(legal_moves_copy):
+    def root_position(self, side):
+        """
+        Take the position to search from the game board.
 
-            # Find the corresponding piece in the copied board
-            copied_piece = board_copy.board[piece.xGrid, piece.yGrid]
-            if copied_piece is None:
-                print(f"Error: Could not find piece at ({piece.xGrid},{piece.yGrid}) in copied board")
-                continue
+        Args:
+            side (str): The side to move ('white' or 'black').
+
+        Returns:
+            tuple: (Bitboard, legal moves); the bitboard is a copy the search may own.
+        """
+        # Search on one bitboard copy of the board for the entire AI evaluation
+        position = self.ChessBoard.toBitboard()
+        if position.side != COLOR_INDEX[side]:
+            position.side = COLOR_INDEX[side]
+            position.rehash()
+
+        return position, self.board_moves(position)
+
+    def board_moves(self, position):
+        """
+        Get the legal moves of a position that the game board can play.
+
+        Args:
+            position (Bitboard): The position.
+
+        Returns:
+            list: The encoded legal moves.
+        """
+        # The board always promotes to a queen, so only queen promotions are played
+        return [move for move in position_status(position)[1]
+                if move_promotion(move) in (0, QUEEN)]
+
+    def search(self, position, legal_moves, time_limit=None, node_limit=None):
+        """
+        Pick the best of the given root moves, in parallel when workers are configured.
+
+        Positions in the opening book are answered from the book without searching.
+
+        Args:
+            position (Bitboard): The root position; restored on return.
+            legal_moves (list): The root moves to choose from.
+            time_limit (float): Seconds to search; defaults to self.time_limit.
+            node_limit (int): Nodes to search; defaults to self.node_limit.
+
+        Returns:
+            int: The best encoded move.
+        """
+        position.status_cache = self.status_cache
+        if self.book is not None:
+            move = self.book.choose(position, self.randomize)
+            if move is not None and move in legal_moves:
+                log.info("Book move %s", move_to_uci(move))
+                self.nodes = 0
+                self.completed_depth = 0
+                self.pv = [move]
+                self.iterations = []
+                self.stopped = False
+                self.finish_pondering()
+                return move
+
+        # Worker processes cannot be switched onto the clock, so pondering searches here
+        if self.parallel is not None and len(legal_moves) > 1 and not self.pondering:
+            return self.parallel_search(position, legal_moves, time_limit, node_limit)
+        return self.iterative_deepening(position, legal_moves, time_limit, node_limit)
+
+    def parallel_search(self, position, legal_moves, time_limit=None, node_limit=None):
+        """
+        Split the root moves across the worker processes.
+
+        Args:
+            position (Bitboard): The root position.
+            legal_moves (list): The root moves to choose from.
+            time_limit (float): Seconds to search; defaults to self.time_limit.
+            node_limit (int): Nodes to search; defaults to self.node_limit.
+
+        Returns:
+            int: The best move found.
+        """
+        if time_limit is None:
+            time_limit = self.time_limit
+        if node_limit is None:
+            node_limit = self.node_limit
+        start = time.perf_counter()
+
+        # Deal the moves out in ordering order so every worker gets some promising ones
+        root_moves = legal_moves.copy()
+        if self.randomize:
+            random.shuffle(root_moves)
+        self.orderer.order(position, root_moves, 0)
+
+        bestMove, bestScore, depth, self.pv, self.nodes = self.parallel.search(
+            position, root_moves, self.depth, time_limit, node_limit)
+        self.completed_depth = depth
+        if bestMove is None:
+            bestMove = root_moves[0]
+            log.warning("No iteration completed, playing %s", move_to_uci(bestMove))
+        else:
+            log.info("Parallel search (%d workers): %s score %s depth %d nodes %d time %.3fs",
+                     self.parallel.workers, move_to_uci(bestMove), bestScore, depth, self.nodes,
+                     time.perf_counter() - start)
+        return bestMove
+
+    def iterative_deepening(self, position, legal_moves, time_limit=None, node_limit=None):
+        """
+        Search one ply deeper at a time until the depth, time or node budget runs out.
+
+        Each iteration searches the previous iteration's best move first and
+        the transposition table carries the principal variation into the
+        next one, so the deeper searches cut off early. While self.pondering
+        is set the limits are held back until ponder_hit(), and a search that
+        ends sooner (a mate, the depth cap) waits for ponder_hit() or stop().
+
+        Args:
+            position (Bitboard): The root position; restored on return.
+            legal_moves (list): The root moves to choose from.
+            time_limit (float): Seconds to search; defaults to self.time_limit.
+            node_limit (int): Nodes to search; defaults to self.node_limit.
+
+        Returns:
+            int: The best move of the last completed iteration.
+        """
+        if time_limit is None:
+            time_limit = self.time_limit
+        if node_limit is None:
+            node_limit = self.node_limit
+        self.start_time = time.perf_counter()
+        self.nodes = 0
+        with self.budget_lock:
+            self.move_time = time_limit
+            self.move_nodes = node_limit
+            if self.pondering:
+                self.deadline = float('inf')
+                self.max_nodes = float('inf')
+            else:
+                self.apply_limits()
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.stopped = False
+        self.tracing = is_enabled(log, TRACE)
+        self.debugging = is_enabled(log, DEBUG)
+        self.reporting = is_enabled(log, INFO)
+        self.root_ply = len(position.history)
+        position.status_cache = self.status_cache
+        self.completed_depth = 0
+        self.pv = []
+        self.iterations = []
+
+        # Make a copy of the list before shuffling to avoid modifying the original;
+        # the ordering sort is stable, so shuffled ties stay in random order
+        root_moves = legal_moves.copy()
+        if self.randomize:
+            random.shuffle(root_moves)
+
+        # Start from the previous search's best move, if it is still playable
+        self.orderer.new_search()
+        self.orderer.order(position, root_moves, 0, self.tt.best_move(position.hash))
+
+        bestMove = None
+        for depth in range(1, self.depth + 1):
+            result = self.search_root(position, root_moves, depth)
+            if result is None:
+                log.debug("Search stopped during depth %d", depth)
+                break
+            bestMove, bestScore = result
+            self.completed_depth = depth
+            self.pv = self.principal_variation(position, depth)
+            self.iterations.append((depth, bestMove, bestScore, self.pv))
+
+            # Search the best move first in the next iteration
+            root_moves.remove(bestMove)
+            root_moves.insert(0, bestMove)
+
+            elapsed = time.perf_counter() - self.start_time
+            if self.on_iteration is not None:
+                self.on_iteration(depth, bestMove, bestScore, self.nodes, elapsed, self.pv)
+            if self.reporting:
+                log.info("Depth %d: %s score %s nodes %d time %.3fs pv %s", depth, move_to_uci(bestMove),
+                         bestScore, self.nodes, elapsed, " ".join(move_to_uci(m) for m in self.pv))
+
+            if abs(bestScore) > MATE_BOUND:
+                break
+            # The next iteration takes several times longer; don't start one we can't finish
+            with self.budget_lock:
+                if not self.pondering and time_limit is not None and elapsed > time_limit / 2:
+                    break
 
-            copied_piece.move(move, False)
-            game_copy.turn = 1 - game_copy.turn
+        self.finish_pondering()
+
+        if bestMove is None:
+            bestMove = self.root_best if self.root_best is not None else root_moves[0]
+            log.warning("No iteration completed, playing %s", move_to_uci(bestMove))
+        else:
+            log.info("Final best move: %s with score %s", move_to_uci(bestMove), bestScore)
+        return bestMove
+
+    def search_root(self, position, root_moves, depth):
+        """
+        Search every root move to a fixed depth.
+
+        In a parallel search the bound each move is searched with is also
+        tightened by the best score the other workers have shared; moves that
+        beat it are shared in turn.
+
+        Args:
+            position (Bitboard): The root position; restored on return.
+            root_moves (list): The root moves, in the order to search them.
+            depth (int): The depth to search to.
+
+        Returns:
+            tuple: (best move, score), or None if the budget ran out first.
+        """
+        white = position.side == WHITE
+        bestScore = float('-inf') if white else float('inf')
+        self.root_best = None
+        shared = self.shared_bound
+        # Whether bestScore is exact rather than a fail-low against a shared bound
+        exact = True
+
+        for move in root_moves:
+            # Only a move that beats the best score so far matters, so that score is the bound
+            bound = bestScore if shared is None else shared.bound(depth, bestScore, white)
+            position.make_move(move)
 
             # Determine if the AI is maximizing or minimizing
-            if side == "white":
+            if white:
                 # AI is white (maximizing), opponent is black (minimizing)
-                score = self.best_move(game_copy, self.depth - 1, float('-inf'), float('inf'), False)
+                score = self.best_move(position, depth - 1, bound, float('inf'), False)
             else:
-                # AI is black (minimizing), opponent is white (maximizing)  
-                score = self.best_move(game_copy, self.depth - 1, float('-inf'), float('inf'), True)
+                # AI is black (minimizing), opponent is white (maximizing)
+                score = self.best_move(position, depth - 1, float('-inf'), bound, True)
 
-           
-            board_copy.moveStack.undoMove(False)
-            # Restore turn
-            game_copy.turn = 1 - game_copy.turn
+            position.unmake_move(move)
+            if self.stopped:
+                return None
 
-            print(f"Move {piece.ID} from ({piece.xGrid},{piece.yGrid}) to {move} scored: {score}")
+            if self.debugging:
+                log.debug("Move %s scored: %s", move_to_uci(move), score)
+            beats_bound = score > bound if white else score < bound
+            if shared is not None and beats_bound:
+                shared.offer(depth, move, score, white)
 
             # Update best move based on player type
-            if side == "white" and score > bestScore:
+            if white and score > bestScore:
                 bestScore = score
-                bestMove = (piece, move)  # Return original piece, not copied piece
-                print(f"New best move for white: {piece.ID} from ({piece.xGrid},{piece.yGrid}) to {move}, score: {bestScore}")
-            elif side == "black" and score < bestScore:
+                self.root_best = move
+                exact = beats_bound
+                if self.debugging:
+                    log.debug("New best move for white: %s, score: %s", move_to_uci(move), bestScore)
+            elif not white and score < bestScore:
                 bestScore = score
-                bestMove = (piece, move)  # Return original piece, not copied piece
-                print(f"New best move for black: {piece.ID} from ({piece.xGrid},{piece.yGrid}) to {move}, score: {bestScore}")
+                self.root_best = move
+                exact = beats_bound
+                if self.debugging:
+                    log.debug("New best move for black: %s, score: %s", move_to_uci(move), bestScore)
 
-        if bestMove == None:
-            bestMove = random.choice(legal_moves)  # Use original legal_moves
-            print(f"No improvement found, random move: {bestMove[0].ID} from ({bestMove[0].xGrid},{bestMove[0].yGrid}) to {bestMove[1]}")
-        else:
-            print(f"Final best move: {bestMove[0].ID} from ({bestMove[0].xGrid},{bestMove[0].yGrid}) to {bestMove[1]} with score {bestScore}")
+        # Past a shared bound only a limit on the true score is known
+        bound_type = EXACT if exact else (UPPER if white else LOWER)
+        self.tt.store(position.hash, depth, score_to_tt(bestScore, 0), bound_type, self.root_best)
+        return self.root_best, bestScore
+
+    def apply_limits(self):
+        """Set the deadline and node cap of the current search from its time and node limits."""
+        self.deadline = (self.start_time + self.move_time if self.move_time is not None
+                         else float('inf'))
+        self.max_nodes = self.move_nodes if self.move_nodes is not None else float('inf')
+
+    def ponder_hit(self):
+        """
+        The opponent played the move being pondered: keep the search going,
+        now under its time and node limits (e.g. called from another thread).
+
+        The time and nodes spent pondering count toward the move, so after a
+        long ponder the best move found so far is played almost at once.
+        """
+        with self.budget_lock:
+            if self.pondering:
+                self.pondering = False
+                self.apply_limits()
+                self.ponder_done.notify_all()
+
+    def close(self):
+        """Shut down the worker processes and close the opening book."""
+        if self.parallel is not None:
+            self.parallel.close()
+        if self.book is not None:
+            self.book.close()
+            self.book = None
 
-        return bestMove
\ No newline at end of file
+    def stop(self):
+        """Ask a running search to return as soon as possible, e.g. from another thread."""
+        self.stopped = True
+        if self.parallel is not None:
+            self.parallel.stop()
+        with self.budget_lock:
+            self.ponder_done.notify_all()
+
+    def finish_pondering(self):
+        """
+        Hold a search that finished while pondering until ponder_hit() or stop().
+
+        Its move must not be reported before the opponent has moved, however
+        early the search found a mate, reached its depth or hit the book.
+        """
+        with self.ponder_done:
+            while self.pondering and not self.stopped:
+                self.ponder_done.wait()
+            self.pondering = False
+
+    def check_limits(self):
+        """Stop the search once the time or node budget is spent, or the parallel search was stopped."""
+        if self.nodes >= self.max_nodes or time.perf_counter() >= self.deadline:
+            self.stopped = True
+        elif self.shared_bound is not None and self.shared_bound.stop_requested():
+            self.stopped = True
+
+    def principal_variation(self, position, depth):
+        """
+        Follow the best moves stored in the transposition table from a position.
+
+        Args:
+            position (Bitboard): The position to start from; restored on return.
+            depth (int): The maximum number of moves to follow.
+
+        Returns:
+            list: The encoded moves of the principal variation.
+        """
+        pv = []
+        seen = set()
+        while len(pv) < depth and position.hash not in seen:
+            seen.add(position.hash)
+            move = self.tt.best_move(position.hash)
+            if not move or move not in position_status(position)[1]:
+                break
+            position.make_move(move)
+            pv.append(move)
+        for move in reversed(pv):
+            position.unmake_move(move)
+        return pv
+
+    def to_board_move(self, move):
+        """
+        Translate an encoded move into the game's (piece, (x, y)) form.
+
+        Args:
+            move (int): The encoded move.
+
+        Returns:
+            tuple: (piece, (x, y)) with the piece taken from the game board.
+        """
+        fromX, fromY = square_xy(move_from(move))
+        return self.ChessBoard.board[fromX, fromY], square_xy(move_to(move))
@@ -0,0 +1,101 @@
+"""
+Move ordering for the alpha-beta search.
+
+Moves are searched in this order: the transposition table move, captures
+and promotions by MVV-LVA (most valuable victim, least valuable attacker),
+the two killer moves of the current ply, then quiet moves by their history
+score. The better the first move, the sooner alpha-beta can cut off.
+"""
+from Engine.bitboard import EMPTY, PAWN
+from Engine.move import CAPTURE, EN_PASSANT
+
+MAX_PLY = 128
+
+# Ordering value of each piece type (KING, QUEEN, ROOK, BISHOP, KNIGHT, PAWN)
+ORDER_VALUE = [20, 9, 5, 3, 3, 1]
+
+HASH_MOVE_SCORE = 1 << 30
+CAPTURE_SCORE = 1 << 26
+KILLER_SCORES = (1 << 25, (1 << 25) - 1)
+# Quiet move history is scaled down once it gets near the killer scores
+HISTORY_LIMIT = 1 << 24
+
+
+class MoveOrderer:
+    """Scores moves using killer and history tables learned during the search."""
+    def __init__(self):
+        self.killers = [[0, 0] for _ in range(MAX_PLY)]
+        # history[piece index][destination square]
+        self.history = [[0] * 64 for _ in range(12)]
+
+    def new_search(self):
+        """Reset killers and age the history table before a new search."""
+        self.killers = [[0, 0] for _ in range(MAX_PLY)]
+        for table in self.history:
+            for sq in range(64):
+                table[sq] >>= 1
+
+    def order(self, position, moves, ply, hash_move=0):
+        """
+        Sort moves in place, most promising first.
+
+        Python's sort is stable, so moves with equal scores keep their
+        incoming order; shuffle beforehand to break ties randomly.
+
+        Args:
+            position (Bitboard): The position the moves belong to.
+            moves (list): Encoded moves to sort.
+            ply (int): Distance from the root, selecting the killer slots.
+            hash_move (int): The transposition table move, searched first.
+        """
+        mailbox = position.mailbox
+        history = self.history
+        killer1, killer2 = self.killers[ply] if ply < MAX_PLY else (0, 0)
+
+        def score(move):
+            if move == hash_move:
+                return HASH_MOVE_SCORE
+            promotion = (move >> 12) & 7
+            if move & CAPTURE or promotion:
+                if move & EN_PASSANT:
+                    victim = PAWN
+                else:
+                    captured = mailbox[(move >> 6) & 63]
+                    victim = captured % 6 if captured != EMPTY else PAWN
+                attacker = mailbox[move & 63] % 6
+                value = CAPTURE_SCORE + ORDER_VALUE[victim] * 100 - ORDER_VALUE[attacker]
+                if promotion:
+                    value += ORDER_VALUE[promotion] * 100
+                return value
+            if move == killer1:
+                return KILLER_SCORES[0]
+            if move == killer2:
+                return KILLER_SCORES[1]
+            return history[mailbox[move & 63]][(move >> 6) & 63]
+
+        moves.sort(key=score, reverse=True)
+
+    def record_cutoff(self, position, move, ply, depth):
+        """
+        Learn from a quiet move that caused a beta cutoff.
+
+        Args:
+            position (Bitboard): The position the move was played from.
+            move (int): The encoded move.
+            ply (int): Distance from the root.
+            depth (int): Remaining depth; deeper cutoffs weigh more.
+        """
+        if move & CAPTURE or (move >> 12) & 7:
+            return
+        if ply < MAX_PLY:
+            killers = self.killers[ply]
+            if killers[0] != move:
+                killers[1] = killers[0]
+                killers[0] = move
+        table = self.history[position.mailbox[move & 63]]
+        to_sq = (move >> 6) & 63
+        table[to_sq] += depth * depth
+        if table[to_sq] > HISTORY_LIMIT:
+            for history in self.history:
+                for sq in range(64):
+                    history[sq] >>= 1
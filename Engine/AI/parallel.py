@@ -0,0 +1,228 @@
+"""
+Root-parallel search over a process pool.
+
+The root moves are dealt round-robin to the workers, which each run their
+own iterative deepening over their share. The workers share one bound per
+depth (see SharedBound): the best exact root score any of them has found
+so far. Each searches its root moves with that score as alpha (beta for
+black) instead of a full window, and publishes every move that beats it.
+Scores are only comparable at equal depth, so the parent takes the best
+shared move at the deepest depth all of the workers finished.
+
+Positions cross the process boundary as Bitboard snapshots (one flat
+buffer), never as piece objects. Each worker process keeps one search,
+and with it its transposition table, for the whole game, and restores
+every position it is sent into the same Bitboard.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from Engine.bitboard import Bitboard, WHITE
+from Engine.AI.ordering import MAX_PLY
+
+# Search and position owned by the current worker process, created on its first task
+_worker_search = None
+_worker_position = None
+# The pool's SharedBound, handed to each worker process when it starts
+_worker_bound = None
+
+
+class SharedBound:
+    """
+    The best root score and move of each depth, shared by the worker processes.
+
+    Scores are kept from the point of view of the side to move at the root,
+    so higher is always better, and only exact scores are published: a move
+    that failed low against the bound it was searched with is never offered.
+    The workers also poll a shared stop flag, so a search stopped in the
+    parent ends in every process.
+    """
+    def __init__(self, max_depth=MAX_PLY):
+        """
+        Allocate the shared arrays.
+
+        Args:
+            max_depth (int): Deepest depth with a slot; deeper iterations are not shared.
+        """
+        self.scores = multiprocessing.Array("d", max_depth + 1)
+        self.moves = multiprocessing.Array("q", max_depth + 1, lock=False)
+        self.stop_event = multiprocessing.Event()
+        self.reset()
+
+    def reset(self):
+        """Forget every bound and clear the stop flag before a new search."""
+        self.stop_event.clear()
+        with self.scores.get_lock():
+            for depth in range(len(self.scores)):
+                self.scores[depth] = float('-inf')
+                self.moves[depth] = 0
+
+    def bound(self, depth, score, white):
+        """
+        Tighten a worker's root bound with the best score shared at a depth.
+
+        Args:
+            depth (int): The depth being searched.
+            score (float): The worker's own best score so far (white-positive).
+            white (bool): Whether white is to move at the root.
+
+        Returns:
+            float: The tighter of the two bounds (white-positive).
+        """
+        if depth >= len(self.scores):
+            return score
+        shared = self.scores[depth]
+        if shared == float('-inf'):
+            return score
+        return max(score, shared) if white else min(score, -shared)
+
+    def offer(self, depth, move, score, white):
+        """
+        Publish an exact root score if it beats the best shared one.
+
+        Args:
+            depth (int): The depth the move was searched to.
+            move (int): The root move.
+            score (float): Its exact score (white-positive).
+            white (bool): Whether white is to move at the root.
+        """
+        if depth >= len(self.scores):
+            return
+        value = score if white else -score
+        with self.scores.get_lock():
+            if value > self.scores[depth]:
+                self.scores[depth] = value
+                self.moves[depth] = move
+
+    def best(self, depth, white):
+        """
+        Get the best move shared at a depth.
+
+        Args:
+            depth (int): The depth.
+            white (bool): Whether white is to move at the root.
+
+        Returns:
+            tuple: (move, white-positive score), or (None, 0) if none was shared.
+        """
+        with self.scores.get_lock():
+            value, move = self.scores[depth], self.moves[depth]
+        if value == float('-inf'):
+            return None, 0
+        return move, value if white else -value
+
+
+    def stop(self):
+        """Ask every worker to return its best move so far."""
+        self.stop_event.set()
+
+    def stop_requested(self):
+        """Whether the search has been stopped (polled by the workers)."""
+        return self.stop_event.is_set()
+
+
+def init_worker(bound):
+    """Keep the pool's shared bound in a new worker process."""
+    global _worker_bound
+    _worker_bound = bound
+
+
+def search_worker(snapshot, root_moves, depth, hash_mb, time_limit, node_limit):
+    """
+    Search a share of the root moves in a worker process.
+
+    Args:
+        snapshot (bytes): The root position from Bitboard.snapshot.
+        root_moves (list): The encoded root moves to search, best first.
+        depth (int): Maximum search depth in plies.
+        hash_mb (float): Transposition table budget of this worker.
+        time_limit (float): Seconds to search, or None for no limit.
+        node_limit (int): Nodes to search, or None for no limit.
+
+    Returns:
+        tuple: (list of (depth, move, score, pv) per completed iteration, nodes searched).
+    """
+    global _worker_search, _worker_position
+    from Engine.AI.minmax import MinMax
+    if _worker_search is None or _worker_search.tt.size_mb != hash_mb:
+        _worker_search = MinMax(None, None, depth, hash_mb, randomize=False)
+    _worker_search.depth = depth
+    _worker_search.shared_bound = _worker_bound
+    if _worker_position is None:
+        _worker_position = Bitboard()
+    _worker_position.restore(snapshot)
+    _worker_search.iterative_deepening(_worker_position, root_moves, time_limit, node_limit)
+    return _worker_search.iterations, _worker_search.nodes
+
+
+class ParallelSearch:
+    """Splits the root moves of a search across worker processes."""
+    def __init__(self, workers=None, hash_mb=16):
+        """
+        Set up the search; the processes start on first use.
+
+        Args:
+            workers (int): Number of worker processes; defaults to the CPU count.
+            hash_mb (float): Transposition table budget of each worker.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.hash_mb = hash_mb
+        self.pool = None
+        self.bound = None
+
+    def search(self, position, root_moves, depth, time_limit=None, node_limit=None):
+        """
+        Search the root moves in parallel.
+
+        Args:
+            position (Bitboard): The root position.
+            root_moves (list): The encoded root moves, best first.
+            depth (int): Maximum search depth in plies.
+            time_limit (float): Seconds to search, or None for no limit.
+            node_limit (int): Total nodes to search, or None for no limit.
+
+        Returns:
+            tuple: (best move, score, depth, pv, nodes); the move is None if
+                some worker completed no iteration.
+        """
+        if self.pool is None:
+            self.bound = SharedBound()
+            self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker,
+                                            initargs=(self.bound,))
+        self.bound.reset()
+
+        snapshot = position.snapshot()
+        shares = [root_moves[i::self.workers] for i in range(self.workers)]
+        shares = [share for share in shares if share]
+        worker_nodes = node_limit // len(shares) if node_limit is not None else None
+        futures = [self.pool.submit(search_worker, snapshot, share, depth, self.hash_mb,
+                                    time_limit, worker_nodes)
+                   for share in shares]
+        results = [future.result() for future in futures]
+
+        nodes = sum(worker_nodes for _, worker_nodes in results)
+        common_depth = min(len(iterations) for iterations, _ in results)
+        if common_depth == 0:
+            return None, 0, 0, [], nodes
+
+        # Every root move was searched to the common depth, so the best shared move is the best overall
+        move, score = self.bound.best(common_depth, position.side == WHITE)
+        if move is None:
+            return None, 0, 0, [], nodes
+        pv = [move]
+        for iterations, _ in results:
+            _, worker_move, _, worker_pv = iterations[common_depth - 1]
+            if worker_move == move:
+                pv = worker_pv
+        return move, score, common_depth, pv, nodes
+
+    def stop(self):
+        """Ask a running search to finish now, e.g. from another thread."""
+        if self.bound is not None:
+            self.bound.stop()
+
+    def close(self):
+        """Shut the worker processes down."""
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
@@ -0,0 +1,95 @@
+"""
+Static exchange evaluation (SEE).
+
+Plays out the sequence of captures on one square, each side always
+recapturing with its least valuable attacker and free to stop whenever
+continuing would lose material, and returns the material balance for the
+side making the first capture. X-ray attackers behind a capturing slider
+join in as the square opens up.
+"""
+from Engine.bitboard import KING, QUEEN, ROOK, BISHOP, KNIGHT, PAWN, EMPTY
+from Engine.move import EN_PASSANT
+
+# Exchange value of each piece type in centipawns (see PieceValue)
+SEE_VALUES = [9000, 900, 500, 300, 300, 100]
+# Least valuable attacker first
+ATTACKER_ORDER = (PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING)
+
+
+def capture_gain(position, move):
+    """
+    Material a capture or promotion wins if it is not recaptured.
+
+    Args:
+        position (Bitboard): The position before the move.
+        move (int): An encoded capture or promotion.
+
+    Returns:
+        int: The optimistic material gain.
+    """
+    if move & EN_PASSANT:
+        gain = SEE_VALUES[PAWN]
+    else:
+        captured = position.mailbox[(move >> 6) & 63]
+        gain = SEE_VALUES[captured % 6] if captured != EMPTY else 0
+    promotion = (move >> 12) & 7
+    if promotion:
+        gain += SEE_VALUES[promotion] - SEE_VALUES[PAWN]
+    return gain
+
+
+def static_exchange(position, move):
+    """
+    Estimate the material won or lost by a capture sequence.
+
+    Args:
+        position (Bitboard): The position before the move.
+        move (int): An encoded capture or promotion.
+
+    Returns:
+        int: Material gained by the side to move (negative if the capture loses material).
+    """
+    from_sq = move & 63
+    to_sq = (move >> 6) & 63
+    pieces = position.pieces
+    occupancy = position.occupancy
+    occupied = position.occupied
+
+    if move & EN_PASSANT:
+        gain = [SEE_VALUES[PAWN]]
+        occupied ^= 1 << (to_sq ^ 8)
+    else:
+        captured = position.mailbox[to_sq]
+        gain = [SEE_VALUES[captured % 6] if captured != EMPTY else 0]
+
+    attacker = position.mailbox[from_sq] % 6
+    promotion = (move >> 12) & 7
+    if promotion:
+        gain[0] += SEE_VALUES[promotion] - SEE_VALUES[PAWN]
+        attacker = promotion
+
+    side = position.side
+    from_bit = 1 << from_sq
+    while True:
+        # The piece now on the square may be taken next
+        gain.append(SEE_VALUES[attacker] - gain[-1])
+        if max(-gain[-2], gain[-1]) < 0:
+            break
+        occupied ^= from_bit
+        side ^= 1
+        attackers = position.attackers_to(to_sq, occupied) & occupied & occupancy[side]
+        if not attackers:
+            break
+        base = side * 6
+        for attacker in ATTACKER_ORDER:
+            candidates = attackers & pieces[base + attacker]
+            if candidates:
+                from_bit = candidates & -candidates
+                break
+
+    # Each side may stand pat instead of recapturing
+    depth = len(gain) - 1
+    while depth > 1:
+        depth -= 1
+        gain[depth - 1] = -max(-gain[depth - 1], gain[depth])
+    return gain[0]
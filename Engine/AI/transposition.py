@@ -0,0 +1,118 @@
+"""
+Fixed-size transposition table for the MinMax search.
+
+The table is split into two-slot buckets indexed by the low bits of the
+Zobrist key. Slot 0 is depth-preferred: it only gives way to a search at
+least as deep (or to the same position). Slot 1 is always-replace, so
+recent shallow results still get stored. Each slot keeps the full key,
+the score and one packed integer holding the best move, depth and bound.
+"""
+
+# Bound types
+EXACT = 0
+LOWER = 1  # the score is a lower bound (the search failed high)
+UPPER = 2  # the score is an upper bound (the search failed low)
+
+DEFAULT_SIZE_MB = 16
+# Approximate cost of one slot: three list pointers plus the key, score and data objects
+SLOT_BYTES = 120
+
+MOVE_MASK = (1 << 20) - 1
+
+
+class TranspositionTable:
+    """Depth-preferred plus always-replace hash table of search results."""
+    def __init__(self, size_mb=DEFAULT_SIZE_MB):
+        """
+        Allocate the table.
+
+        Args:
+            size_mb (float): Memory budget in megabytes; the bucket count is
+                the largest power of two that fits.
+        """
+        slots = max(2, int(size_mb * 1024 * 1024) // SLOT_BYTES)
+        buckets = 1 << ((slots // 2).bit_length() - 1)
+        self.size_mb = size_mb
+        self.mask = buckets - 1
+        self.keys = [None] * (buckets * 2)
+        self.scores = [0] * (buckets * 2)
+        self.data = [0] * (buckets * 2)
+        self.probes = 0
+        self.hits = 0
+
+    def clear(self):
+        """Forget every stored entry."""
+        size = len(self.keys)
+        self.keys = [None] * size
+        self.scores = [0] * size
+        self.data = [0] * size
+        self.probes = 0
+        self.hits = 0
+
+    def probe(self, key):
+        """
+        Look up a position.
+
+        Args:
+            key (int): The position's Zobrist key.
+
+        Returns:
+            tuple: (depth, score, bound, move), or None if the position is not stored.
+        """
+        self.probes += 1
+        slot = (key & self.mask) << 1
+        keys = self.keys
+        if keys[slot] != key:
+            slot += 1
+            if keys[slot] != key:
+                return None
+        self.hits += 1
+        data = self.data[slot]
+        return (data >> 20) & 0xFF, self.scores[slot], data >> 28, data & MOVE_MASK
+
+    def store(self, key, depth, score, bound, move):
+        """
+        Record a search result.
+
+        Args:
+            key (int): The position's Zobrist key.
+            depth (int): The remaining depth the result was searched to.
+            score (int): The score found, in centipawns.
+            bound (int): EXACT, LOWER or UPPER.
+            move (int): The best encoded move found, or 0.
+        """
+        slot = (key & self.mask) << 1
+        keys = self.keys
+        if keys[slot] == key or keys[slot] is None or depth >= (self.data[slot] >> 20) & 0xFF:
+            if keys[slot] == key and not move:
+                # Keep the previous best move for ordering
+                move = self.data[slot] & MOVE_MASK
+        else:
+            slot += 1
+            if keys[slot] == key and not move:
+                move = self.data[slot] & MOVE_MASK
+        keys[slot] = key
+        self.scores[slot] = score
+        self.data[slot] = move | (max(depth, 0) << 20) | (bound << 28)
+
+    def best_move(self, key):
+        """
+        Get the stored best move of a position for move ordering.
+
+        Args:
+            key (int): The position's Zobrist key.
+
+        Returns:
+            int: The encoded move, or 0 if none is stored.
+        """
+        slot = (key & self.mask) << 1
+        if self.keys[slot] != key:
+            slot += 1
+            if self.keys[slot] != key:
+                return 0
+        return self.data[slot] & MOVE_MASK
+
+    def hashfull(self):
+        """Permille of slots in use (sampled from the first thousand)."""
+        sample = self.keys[:1000]
+        return sum(1 for key in sample if key is not None) * 1000 // len(sample)
@@ -0,0 +1,154 @@
+"""
+Precomputed attack tables for bitboard move generation.
+
+Leaper attacks (knight, king, pawn) are plain 64-entry lookups. Sliding
+attacks use PEXT-style tables: the occupancy masked to a square's relevant
+ray squares is itself the key into a per-square table, so a rook, bishop or
+queen lookup is one AND plus one table access. Python has no PEXT or cheap
+64-bit multiply, so the masked occupancy is hashed directly by a dict instead
+of being compressed by a magic multiplier.
+"""
+
+ROOK_DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+BISHOP_DIRECTIONS = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+KNIGHT_OFFSETS = [(1, 2), (-1, 2), (1, -2), (-1, -2), (2, 1), (-2, 1), (2, -1), (-2, -1)]
+KING_OFFSETS = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, 1), (1, -1), (-1, -1)]
+
+
+def _leaper_attacks(offsets):
+    table = []
+    for sq in range(64):
+        x, y = sq & 7, sq >> 3
+        mask = 0
+        for dx, dy in offsets:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < 8 and 0 <= ny < 8:
+                mask |= 1 << (ny * 8 + nx)
+        table.append(mask)
+    return table
+
+
+def _ray_attacks(sq, occupied, directions):
+    """Walk each ray from ``sq`` up to and including the first blocker."""
+    attacks = 0
+    x, y = sq & 7, sq >> 3
+    for dx, dy in directions:
+        nx, ny = x + dx, y + dy
+        while 0 <= nx < 8 and 0 <= ny < 8:
+            bit = 1 << (ny * 8 + nx)
+            attacks |= bit
+            if occupied & bit:
+                break
+            nx += dx
+            ny += dy
+    return attacks
+
+
+def _relevant_mask(sq, directions):
+    """Squares whose occupancy can change the attacks from ``sq`` (edges excluded)."""
+    mask = 0
+    x, y = sq & 7, sq >> 3
+    for dx, dy in directions:
+        nx, ny = x + dx, y + dy
+        while 0 <= nx + dx < 8 and 0 <= ny + dy < 8:
+            mask |= 1 << (ny * 8 + nx)
+            nx += dx
+            ny += dy
+    return mask
+
+
+def _slider_tables(directions):
+    masks = []
+    tables = []
+    for sq in range(64):
+        mask = _relevant_mask(sq, directions)
+        table = {}
+        # Enumerate every subset of the mask (Carry-Rippler trick)
+        subset = 0
+        while True:
+            table[subset] = _ray_attacks(sq, subset, directions)
+            subset = (subset - mask) & mask
+            if subset == 0:
+                break
+        masks.append(mask)
+        tables.append(table)
+    return masks, tables
+
+
+KNIGHT_ATTACKS = _leaper_attacks(KNIGHT_OFFSETS)
+KING_ATTACKS = _leaper_attacks(KING_OFFSETS)
+# PAWN_ATTACKS[color][sq]: squares attacked by a pawn of that color on sq
+PAWN_ATTACKS = [_leaper_attacks([(1, 1), (-1, 1)]), _leaper_attacks([(1, -1), (-1, -1)])]
+
+ROOK_MASKS, ROOK_TABLES = _slider_tables(ROOK_DIRECTIONS)
+BISHOP_MASKS, BISHOP_TABLES = _slider_tables(BISHOP_DIRECTIONS)
+
+
+def rook_attacks(sq, occupied):
+    """
+    Get the squares a rook on ``sq`` attacks.
+
+    Args:
+        sq (int): The square index of the rook.
+        occupied (int): Bitboard of all occupied squares.
+
+    Returns:
+        int: Bitboard of attacked squares, including the first blocker on each ray.
+    """
+    return ROOK_TABLES[sq][occupied & ROOK_MASKS[sq]]
+
+
+def bishop_attacks(sq, occupied):
+    """
+    Get the squares a bishop on ``sq`` attacks.
+
+    Args:
+        sq (int): The square index of the bishop.
+        occupied (int): Bitboard of all occupied squares.
+
+    Returns:
+        int: Bitboard of attacked squares, including the first blocker on each ray.
+    """
+    return BISHOP_TABLES[sq][occupied & BISHOP_MASKS[sq]]
+
+
+def queen_attacks(sq, occupied):
+    """
+    Get the squares a queen on ``sq`` attacks.
+
+    Args:
+        sq (int): The square index of the queen.
+        occupied (int): Bitboard of all occupied squares.
+
+    Returns:
+        int: Bitboard of attacked squares, including the first blocker on each ray.
+    """
+    return (ROOK_TABLES[sq][occupied & ROOK_MASKS[sq]] |
+            BISHOP_TABLES[sq][occupied & BISHOP_MASKS[sq]])
+
+
+def _line_tables():
+    """Build the BETWEEN and LINE tables from the rook and bishop rays."""
+    between = [[0] * 64 for _ in range(64)]
+    line = [[0] * 64 for _ in range(64)]
+    for a in range(64):
+        for directions in (ROOK_DIRECTIONS, BISHOP_DIRECTIONS):
+            for direction in directions:
+                ray = _ray_attacks(a, 0, [direction])
+                opposite = _ray_attacks(a, 0, [(-direction[0], -direction[1])])
+                full = ray | opposite | (1 << a)
+                walked = 0
+                x, y = (a & 7) + direction[0], (a >> 3) + direction[1]
+                while 0 <= x < 8 and 0 <= y < 8:
+                    b = y * 8 + x
+                    between[a][b] = walked
+                    line[a][b] = full
+                    walked |= 1 << b
+                    x += direction[0]
+                    y += direction[1]
+    return between, line
+
+
+# BETWEEN[a][b]: squares strictly between two squares on a rank, file or
+# diagonal; LINE[a][b]: the whole line through both. Zero if not aligned.
+BETWEEN, LINE = _line_tables()
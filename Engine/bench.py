@@ -0,0 +1,139 @@
+"""
+Search benchmark.
+
+Searches a fixed set of positions to a fixed depth and prints the results
+as JSON, so runs of different engine versions can be compared directly:
+
+    python -m Engine.bench --depth 5 > bench.json
+
+Per position and in total it reports nodes, time, nodes per second, the
+effective branching factor (the average growth in nodes from one
+iteration to the next), the transposition table hit rate, how often a
+beta cutoff came from the first move searched (a measure of move
+ordering), and the time at which each depth was completed.
+"""
+import argparse
+import json
+import time
+from Engine.fen import parse_fen
+from Engine.movegen import generate_legal_moves
+from Engine.move import move_to_uci
+from Engine.perft import REFERENCE_POSITIONS
+from Engine.AI.minmax import MinMax
+from Engine.AI.transposition import DEFAULT_SIZE_MB
+
+DEFAULT_BENCH_DEPTH = 4
+
+# The perft reference positions plus quieter middlegames and endgames
+BENCH_POSITIONS = tuple((name, fen) for name, fen, _ in REFERENCE_POSITIONS) + (
+    ("italian", "r1bqk2r/pppp1ppp/2n2n2/2b1p3/2B1P3/2NP1N2/PPP2PPP/R1BQK2R b KQkq - 0 5"),
+    ("queens-gambit", "rnbqkb1r/ppp2ppp/4pn2/3p2B1/2PP4/2N5/PP2PPPP/R2QKBNR b KQkq - 3 4"),
+    ("sicilian", "r1bqkb1r/pp2pppp/2np1n2/8/3NP3/2N5/PPP2PPP/R1BQKB1R w KQkq - 2 6"),
+    ("rook-endgame", "8/5pk1/6p1/8/3R4/6P1/r4PK1/8 w - - 0 40"),
+    ("pawn-endgame", "8/8/1p3k2/p1p5/P1P2K2/1P6/8/8 w - - 0 45"),
+)
+
+
+def ratio(part, whole):
+    """Return part / whole rounded for the report, or None if whole is zero."""
+    return round(part / whole, 4) if whole else None
+
+
+def bench_position(name, fen, depth, hash_mb=DEFAULT_SIZE_MB):
+    """
+    Search one position from an empty transposition table.
+
+    Args:
+        name (str): Label for the report.
+        fen (str): The position.
+        depth (int): The depth to search to.
+        hash_mb (float): Transposition table budget in megabytes.
+
+    Returns:
+        dict: The statistics of this search.
+    """
+    position = parse_fen(fen)
+    search = MinMax(None, None, depth, hash_mb, randomize=False)
+    iterations = []
+    search.on_iteration = lambda d, move, score, nodes, seconds, pv: iterations.append(
+        {"depth": d, "nodes": nodes, "time": round(seconds, 4), "move": move_to_uci(move),
+         "score": score})
+
+    start = time.perf_counter()
+    move = search.iterative_deepening(position, generate_legal_moves(position))
+    seconds = time.perf_counter() - start
+
+    # Geometric mean of the node growth between successive iterations
+    ebf = None
+    if len(iterations) > 1:
+        first = iterations[0]["nodes"]
+        last = iterations[-1]["nodes"] - iterations[-2]["nodes"]
+        if first > 0 and last > 0:
+            ebf = round((last / first) ** (1 / (len(iterations) - 1)), 3)
+
+    return {
+        "name": name,
+        "fen": fen,
+        "best_move": move_to_uci(move),
+        "depth": search.completed_depth,
+        "nodes": search.nodes,
+        "time": round(seconds, 4),
+        "nps": int(search.nodes / seconds) if seconds > 0 else 0,
+        "ebf": ebf,
+        "tt_probes": search.tt.probes,
+        "tt_hits": search.tt.hits,
+        "tt_hit_rate": ratio(search.tt.hits, search.tt.probes),
+        "cutoffs": search.cutoffs,
+        "first_move_cutoffs": search.first_move_cutoffs,
+        "first_move_cutoff_rate": ratio(search.first_move_cutoffs, search.cutoffs),
+        "time_to_depth": iterations,
+    }
+
+
+def run_bench(depth=DEFAULT_BENCH_DEPTH, hash_mb=DEFAULT_SIZE_MB, positions=BENCH_POSITIONS):
+    """
+    Search every benchmark position and total the results.
+
+    Args:
+        depth (int): The depth to search each position to.
+        hash_mb (float): Transposition table budget in megabytes.
+        positions (tuple): (name, FEN) pairs.
+
+    Returns:
+        dict: {"depth", "hash_mb", "positions": [...], "total": {...}}.
+    """
+    results = [bench_position(name, fen, depth, hash_mb) for name, fen in positions]
+    nodes = sum(result["nodes"] for result in results)
+    seconds = sum(result["time"] for result in results)
+    ebfs = [result["ebf"] for result in results if result["ebf"] is not None]
+    probes = sum(result["tt_probes"] for result in results)
+    hits = sum(result["tt_hits"] for result in results)
+    cutoffs = sum(result["cutoffs"] for result in results)
+    first_move_cutoffs = sum(result["first_move_cutoffs"] for result in results)
+    return {
+        "depth": depth,
+        "hash_mb": hash_mb,
+        "positions": results,
+        "total": {
+            "nodes": nodes,
+            "time": round(seconds, 4),
+            "nps": int(nodes / seconds) if seconds > 0 else 0,
+            "ebf": round(sum(ebfs) / len(ebfs), 3) if ebfs else None,
+            "tt_hit_rate": ratio(hits, probes),
+            "first_move_cutoff_rate": ratio(first_move_cutoffs, cutoffs),
+        },
+    }
+
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Search benchmark with JSON output")
+    parser.add_argument("--depth", type=int, default=DEFAULT_BENCH_DEPTH, help="search depth")
+    parser.add_argument("--hash", type=float, default=DEFAULT_SIZE_MB,
+                        help="transposition table size in MB")
+    args = parser.parse_args()
+    print(json.dumps(run_bench(args.depth, args.hash), indent=2))
+
+
+if __name__ == "__main__":
+    main()
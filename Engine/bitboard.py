@@ -0,0 +1,524 @@
+import struct
+from Engine.chessPiece import ChessPieceType
+from Engine.attacks import *
+from Engine.move import DOUBLE_PUSH, EN_PASSANT, CASTLE
+from Engine.zobrist import PIECE_KEYS, SIDE_KEY, CASTLING_KEYS, EP_KEYS, compute_hash
+from Engine.evaluation import PIECE_SQUARE_VALUES, score_position
+
+# Side indices
+WHITE = 0
+BLACK = 1
+COLOR_INDEX = {"white": WHITE, "black": BLACK}
+COLOR_NAMES = ("white", "black")
+
+# Castling right bits
+WHITE_KINGSIDE = 1
+WHITE_QUEENSIDE = 2
+BLACK_KINGSIDE = 4
+BLACK_QUEENSIDE = 8
+ALL_CASTLING = WHITE_KINGSIDE | WHITE_QUEENSIDE | BLACK_KINGSIDE | BLACK_QUEENSIDE
+
+# Piece type offsets within a side's six bitboards (ChessPieceType values)
+KING, QUEEN, ROOK, BISHOP, KNIGHT, PAWN = range(6)
+
+NO_SQUARE = -1
+# Mailbox value of an empty square; fits the 4-bit captured field of an undo record
+EMPTY = 12
+EMPTY_MAILBOX = bytes([EMPTY]) * 64
+
+# Flat layout of a position snapshot: the twelve piece masks, both side
+# masks, the mailbox, side, castling rights, en passant square, both
+# clocks, hash and score
+SNAPSHOT = struct.Struct("<14Q64sBBbHHQi")
+
+# Rights that survive a move touching each square (king and rook home squares)
+CASTLING_MASK = [ALL_CASTLING] * 64
+CASTLING_MASK[0] &= ~WHITE_QUEENSIDE
+CASTLING_MASK[4] &= ~(WHITE_KINGSIDE | WHITE_QUEENSIDE)
+CASTLING_MASK[7] &= ~WHITE_KINGSIDE
+CASTLING_MASK[56] &= ~BLACK_QUEENSIDE
+CASTLING_MASK[60] &= ~(BLACK_KINGSIDE | BLACK_QUEENSIDE)
+CASTLING_MASK[63] &= ~BLACK_KINGSIDE
+
+# Rook (from, to) squares keyed by the king's castling destination
+CASTLING_ROOK = {6: (7, 5), 2: (0, 3), 62: (63, 61), 58: (56, 59)}
+
+# Piece types of the back rank from the a-file to the h-file
+BACK_RANK = (ROOK, KNIGHT, BISHOP, QUEEN, KING, BISHOP, KNIGHT, ROOK)
+
+
+def square(x, y):
+    """Convert grid coordinates to a 0-63 square index (a1 = 0, h8 = 63)."""
+    return y * 8 + x
+
+
+def square_xy(sq):
+    """Convert a 0-63 square index back to (x, y) grid coordinates."""
+    return sq & 7, sq >> 3
+
+
+def piece_index(pieceType, color):
+    """
+    Index of a piece kind in the twelve piece bitboards.
+
+    Args:
+        pieceType (ChessPieceType): The type of the piece.
+        color (int): WHITE or BLACK.
+
+    Returns:
+        int: 0-5 for white pieces, 6-11 for black pieces.
+    """
+    return color * 6 + pieceType.value
+
+
+PIECE_TYPES = [ChessPieceType(i % 6) for i in range(12)]
+PIECE_COLORS = [i // 6 for i in range(12)]
+
+
+def iter_bits(bb):
+    """Yield the square index of every set bit, lowest first."""
+    while bb:
+        lsb = bb & -bb
+        yield lsb.bit_length() - 1
+        bb ^= lsb
+
+
+def pack_undo(captured, castling, ep_square, halfmove):
+    """
+    Pack the state a move destroys into one integer undo record.
+
+    Layout: bits 0-3 captured piece (EMPTY if none), 4-7 castling rights,
+    8-14 en passant square + 1, 15 and up the halfmove clock.
+    """
+    return captured | (castling << 4) | ((ep_square + 1) << 8) | (halfmove << 15)
+
+
+def start_position():
+    """
+    Build the standard starting position without any piece objects.
+
+    Returns:
+        Bitboard: White to move with all castling rights.
+    """
+    position = Bitboard()
+    for x, pieceType in enumerate(BACK_RANK):
+        position.put_piece(square(x, 0), WHITE * 6 + pieceType)
+        position.put_piece(square(x, 1), WHITE * 6 + PAWN)
+        position.put_piece(square(x, 6), BLACK * 6 + PAWN)
+        position.put_piece(square(x, 7), BLACK * 6 + pieceType)
+    position.castling = ALL_CASTLING
+    position.rehash()
+    return position
+
+
+class Bitboard:
+    """Position stored as twelve 64-bit piece masks plus game state."""
+    def __init__(self):
+        self.pieces = [0] * 12
+        self.occupancy = [0, 0]
+        self.occupied = 0
+        # Piece index on every square (EMPTY if none), one byte per square
+        self.mailbox = bytearray(EMPTY_MAILBOX)
+        self.side = WHITE
+        self.castling = 0
+        self.ep_square = NO_SQUARE
+        self.halfmove = 0
+        self.fullmove = 1
+        self.history = []
+        self.hash = 0
+        self.hash_history = []
+        # Material and piece-square score in centipawns, kept up to date on every change
+        self.score = 0
+        self.score_history = []
+        # Position hash -> (in check, legal moves), see movegen.position_status
+        self.status_cache = {}
+
+    def put_piece(self, sq, index):
+        """Place piece ``index`` on the empty square ``sq``."""
+        bit = 1 << sq
+        self.pieces[index] |= bit
+        self.occupancy[PIECE_COLORS[index]] |= bit
+        self.occupied |= bit
+        self.mailbox[sq] = index
+        self.hash ^= PIECE_KEYS[index][sq]
+        self.score += PIECE_SQUARE_VALUES[index][sq]
+
+    def remove_piece(self, sq, index):
+        """Remove piece ``index`` from square ``sq``."""
+        bit = 1 << sq
+        self.pieces[index] &= ~bit
+        self.occupancy[PIECE_COLORS[index]] &= ~bit
+        self.occupied &= ~bit
+        self.mailbox[sq] = EMPTY
+        self.hash ^= PIECE_KEYS[index][sq]
+        self.score -= PIECE_SQUARE_VALUES[index][sq]
+
+    def piece_at(self, sq):
+        """
+        Get the piece standing on a square.
+
+        Args:
+            sq (int): The square index.
+
+        Returns:
+            int: The piece index, or None if the square is empty.
+        """
+        index = self.mailbox[sq]
+        return None if index == EMPTY else index
+
+    def find(self, pieceType, color):
+        """
+        Find the lowest square holding a given piece.
+
+        Args:
+            pieceType (ChessPieceType): The type of the piece to find.
+            color (int): WHITE or BLACK.
+
+        Returns:
+            int: The square index, or None if there is no such piece.
+        """
+        bb = self.pieces[piece_index(pieceType, color)]
+        if not bb:
+            return None
+        return (bb & -bb).bit_length() - 1
+
+    def rehash(self):
+        """Recompute the Zobrist key and score after state was assigned directly."""
+        self.hash = compute_hash(self)
+        self.score = score_position(self.pieces)
+
+    def is_square_attacked(self, sq, by_color, occupied=None):
+        """
+        Check whether any piece of one side attacks a square.
+
+        Each piece type is answered with a single table lookup from the
+        target square, so no moves are generated.
+
+        Args:
+            sq (int): The square index to test.
+            by_color (int): The attacking side, WHITE or BLACK.
+            occupied (int): Occupancy to use for sliding pieces; defaults to
+                the current board. Pass the board without a moving king to
+                test the squares that king could step to.
+
+        Returns:
+            bool: True if the square is attacked, False otherwise.
+        """
+        pieces = self.pieces
+        base = by_color * 6
+        if PAWN_ATTACKS[by_color ^ 1][sq] & pieces[base + PAWN]:
+            return True
+        if KNIGHT_ATTACKS[sq] & pieces[base + KNIGHT]:
+            return True
+        if KING_ATTACKS[sq] & pieces[base + KING]:
+            return True
+        if occupied is None:
+            occupied = self.occupied
+        queens = pieces[base + QUEEN]
+        if ROOK_TABLES[sq][occupied & ROOK_MASKS[sq]] & (pieces[base + ROOK] | queens):
+            return True
+        if BISHOP_TABLES[sq][occupied & BISHOP_MASKS[sq]] & (pieces[base + BISHOP] | queens):
+            return True
+        return False
+
+    def attackers_to(self, sq, occupied):
+        """
+        Get the pieces of both sides that attack a square.
+
+        Args:
+            sq (int): The square index.
+            occupied (int): Occupancy used to block sliding pieces.
+
+        Returns:
+            int: Bitboard of attacking pieces (mask with ``occupied`` to drop
+                pieces already removed from the board).
+        """
+        pieces = self.pieces
+        diagonal = pieces[QUEEN] | pieces[BISHOP] | pieces[6 + QUEEN] | pieces[6 + BISHOP]
+        straight = pieces[QUEEN] | pieces[ROOK] | pieces[6 + QUEEN] | pieces[6 + ROOK]
+        return ((PAWN_ATTACKS[BLACK][sq] & pieces[PAWN]) |
+                (PAWN_ATTACKS[WHITE][sq] & pieces[6 + PAWN]) |
+                (KNIGHT_ATTACKS[sq] & (pieces[KNIGHT] | pieces[6 + KNIGHT])) |
+                (KING_ATTACKS[sq] & (pieces[KING] | pieces[6 + KING])) |
+                (BISHOP_TABLES[sq][occupied & BISHOP_MASKS[sq]] & diagonal) |
+                (ROOK_TABLES[sq][occupied & ROOK_MASKS[sq]] & straight))
+
+    def _state_key(self):
+        """Zobrist key of the castling rights and en passant file."""
+        key = CASTLING_KEYS[self.castling]
+        if self.ep_square != NO_SQUARE:
+            key ^= EP_KEYS[self.ep_square & 7]
+        return key
+
+    def push_state(self, from_sq, to_sq, is_pawn, is_capture):
+        """
+        Save the irreversible state and advance it for a move.
+
+        The piece masks (and their hash keys) are updated separately as
+        squares are written; this only tracks side to move, castling,
+        en passant and clocks.
+
+        Args:
+            from_sq (int): The origin square of the move.
+            to_sq (int): The destination square of the move.
+            is_pawn (bool): Whether the moving piece is a pawn.
+            is_capture (bool): Whether the move captures.
+        """
+        self.history.append(pack_undo(EMPTY, self.castling, self.ep_square, self.halfmove))
+        self.hash ^= self._state_key()
+        self.castling &= CASTLING_MASK[from_sq] & CASTLING_MASK[to_sq]
+        if is_pawn and abs(to_sq - from_sq) == 16:
+            self.ep_square = (from_sq + to_sq) >> 1
+        else:
+            self.ep_square = NO_SQUARE
+        self.hash ^= self._state_key() ^ SIDE_KEY
+        self.halfmove = 0 if is_pawn or is_capture else self.halfmove + 1
+        if self.side == BLACK:
+            self.fullmove += 1
+        self.side ^= 1
+
+    def pop_state(self):
+        """Restore the state saved by the matching push_state call."""
+        record = self.history.pop()
+        self.hash ^= self._state_key()
+        self.castling = (record >> 4) & 15
+        self.ep_square = ((record >> 8) & 127) - 1
+        self.halfmove = record >> 15
+        self.hash ^= self._state_key() ^ SIDE_KEY
+        self.side ^= 1
+        if self.side == BLACK:
+            self.fullmove -= 1
+
+    def in_check(self):
+        """Check whether the side to move is in check."""
+        king = self.pieces[self.side * 6 + KING]
+        if not king:
+            return False
+        return self.is_square_attacked(king.bit_length() - 1, self.side ^ 1)
+
+    def make_move(self, move):
+        """
+        Play an already generated move without revalidating it.
+
+        The state the move destroys is pushed onto ``history`` as a single
+        packed integer and the previous Zobrist key and score onto
+        ``hash_history`` and ``score_history``, so the pair
+        make_move/unmake_move allocates nothing beyond that.
+
+        Args:
+            move (int): The encoded move (see Engine.move).
+        """
+        from_sq = move & 63
+        to_sq = (move >> 6) & 63
+        pieces = self.pieces
+        occupancy = self.occupancy
+        mailbox = self.mailbox
+        us = self.side
+        piece = mailbox[from_sq]
+
+        cap_sq = to_sq ^ 8 if move & EN_PASSANT else to_sq
+        captured = mailbox[cap_sq]
+        self.history.append(captured | (self.castling << 4) |
+                            ((self.ep_square + 1) << 8) | (self.halfmove << 15))
+        key = self.hash
+        self.hash_history.append(key)
+        key ^= SIDE_KEY ^ CASTLING_KEYS[self.castling]
+        if self.ep_square != NO_SQUARE:
+            key ^= EP_KEYS[self.ep_square & 7]
+        score = self.score
+        self.score_history.append(score)
+
+        if captured != EMPTY:
+            bit = 1 << cap_sq
+            pieces[captured] ^= bit
+            occupancy[us ^ 1] ^= bit
+            mailbox[cap_sq] = EMPTY
+            key ^= PIECE_KEYS[captured][cap_sq]
+            score -= PIECE_SQUARE_VALUES[captured][cap_sq]
+            self.halfmove = 0
+        elif piece % 6 == PAWN:
+            self.halfmove = 0
+        else:
+            self.halfmove += 1
+
+        move_bits = (1 << from_sq) | (1 << to_sq)
+        pieces[piece] ^= move_bits
+        occupancy[us] ^= move_bits
+        mailbox[from_sq] = EMPTY
+        mailbox[to_sq] = piece
+        piece_keys = PIECE_KEYS[piece]
+        key ^= piece_keys[from_sq] ^ piece_keys[to_sq]
+        values = PIECE_SQUARE_VALUES[piece]
+        score += values[to_sq] - values[from_sq]
+
+        promotion = (move >> 12) & 7
+        if promotion:
+            to_bit = 1 << to_sq
+            pieces[piece] ^= to_bit
+            key ^= piece_keys[to_sq]
+            score -= values[to_sq]
+            piece = us * 6 + promotion
+            pieces[piece] |= to_bit
+            mailbox[to_sq] = piece
+            key ^= PIECE_KEYS[piece][to_sq]
+            score += PIECE_SQUARE_VALUES[piece][to_sq]
+        elif move & CASTLE:
+            rook_from, rook_to = CASTLING_ROOK[to_sq]
+            rook = us * 6 + ROOK
+            rook_bits = (1 << rook_from) | (1 << rook_to)
+            pieces[rook] ^= rook_bits
+            occupancy[us] ^= rook_bits
+            mailbox[rook_from] = EMPTY
+            mailbox[rook_to] = rook
+            key ^= PIECE_KEYS[rook][rook_from] ^ PIECE_KEYS[rook][rook_to]
+            score += PIECE_SQUARE_VALUES[rook][rook_to] - PIECE_SQUARE_VALUES[rook][rook_from]
+
+        self.score = score
+        self.occupied = occupancy[0] | occupancy[1]
+        self.castling &= CASTLING_MASK[from_sq] & CASTLING_MASK[to_sq]
+        key ^= CASTLING_KEYS[self.castling]
+        if move & DOUBLE_PUSH:
+            self.ep_square = (from_sq + to_sq) >> 1
+            key ^= EP_KEYS[from_sq & 7]
+        else:
+            self.ep_square = NO_SQUARE
+        self.hash = key
+        if us == BLACK:
+            self.fullmove += 1
+        self.side = us ^ 1
+
+    def unmake_move(self, move):
+        """
+        Take back the last move played with make_move.
+
+        Args:
+            move (int): The same encoded move passed to make_move.
+        """
+        record = self.history.pop()
+        self.hash = self.hash_history.pop()
+        self.score = self.score_history.pop()
+        us = self.side ^ 1
+        self.side = us
+        if us == BLACK:
+            self.fullmove -= 1
+        self.castling = (record >> 4) & 15
+        self.ep_square = ((record >> 8) & 127) - 1
+        self.halfmove = record >> 15
+
+        from_sq = move & 63
+        to_sq = (move >> 6) & 63
+        pieces = self.pieces
+        occupancy = self.occupancy
+        mailbox = self.mailbox
+        piece = mailbox[to_sq]
+
+        if (move >> 12) & 7:
+            to_bit = 1 << to_sq
+            pieces[piece] ^= to_bit
+            piece = us * 6 + PAWN
+            pieces[piece] |= to_bit
+        elif move & CASTLE:
+            rook_from, rook_to = CASTLING_ROOK[to_sq]
+            rook = us * 6 + ROOK
+            rook_bits = (1 << rook_from) | (1 << rook_to)
+            pieces[rook] ^= rook_bits
+            occupancy[us] ^= rook_bits
+            mailbox[rook_to] = EMPTY
+            mailbox[rook_from] = rook
+
+        move_bits = (1 << from_sq) | (1 << to_sq)
+        pieces[piece] ^= move_bits
+        occupancy[us] ^= move_bits
+        mailbox[to_sq] = EMPTY
+        mailbox[from_sq] = piece
+
+        captured = record & 15
+        if captured != EMPTY:
+            cap_sq = to_sq ^ 8 if move & EN_PASSANT else to_sq
+            bit = 1 << cap_sq
+            pieces[captured] |= bit
+            occupancy[us ^ 1] |= bit
+            mailbox[cap_sq] = captured
+
+        self.occupied = occupancy[0] | occupancy[1]
+
+    def copy(self):
+        """
+        Create a copy of the position.
+
+        Returns:
+            Bitboard: A new Bitboard with the same state.
+        """
+        new_bb = Bitboard.__new__(Bitboard)
+        new_bb.pieces = self.pieces[:]
+        new_bb.occupancy = self.occupancy[:]
+        new_bb.occupied = self.occupied
+        new_bb.mailbox = self.mailbox[:]
+        new_bb.side = self.side
+        new_bb.castling = self.castling
+        new_bb.ep_square = self.ep_square
+        new_bb.halfmove = self.halfmove
+        new_bb.fullmove = self.fullmove
+        new_bb.history = self.history[:]
+        new_bb.hash = self.hash
+        new_bb.hash_history = self.hash_history[:]
+        new_bb.score = self.score
+        new_bb.score_history = self.score_history[:]
+        # Entries are keyed by position, so copies can share them
+        new_bb.status_cache = self.status_cache
+        return new_bb
+
+    def snapshot(self):
+        """
+        Pack the position into one flat buffer.
+
+        Move history is not included; a position restored from the snapshot
+        starts from here, so the cost does not grow with the game. Snapshots
+        are plain bytes, cheap to keep and to send to another process.
+
+        Returns:
+            bytes: The packed position (SNAPSHOT.size bytes).
+        """
+        return SNAPSHOT.pack(*self.pieces, *self.occupancy, self.mailbox, self.side,
+                             self.castling, self.ep_square, self.halfmove, self.fullmove,
+                             self.hash, self.score)
+
+    def restore(self, data):
+        """
+        Overwrite this position in place with a snapshot.
+
+        Reusing one Bitboard this way allocates nothing; the move history
+        is cleared.
+
+        Args:
+            data (bytes): A snapshot from snapshot().
+        """
+        values = SNAPSHOT.unpack(data)
+        self.pieces[:] = values[:12]
+        self.occupancy[:] = values[12:14]
+        self.occupied = values[12] | values[13]
+        self.mailbox[:] = values[14]
+        (self.side, self.castling, self.ep_square, self.halfmove, self.fullmove,
+         self.hash, self.score) = values[15:]
+        self.history.clear()
+        self.hash_history.clear()
+        self.score_history.clear()
+
+    @classmethod
+    def from_snapshot(cls, data, status_cache=None):
+        """
+        Build a new position from a snapshot.
+
+        Args:
+            data (bytes): A snapshot from snapshot().
+            status_cache (dict): Status cache to share (see movegen.position_status);
+                a new one if None.
+
+        Returns:
+            Bitboard: The unpacked position.
+        """
+        position = cls()
+        position.restore(data)
+        if status_cache is not None:
+            position.status_cache = status_cache
+        return position
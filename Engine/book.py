@@ -0,0 +1,176 @@
+"""
+Polyglot opening books.
+
+A book file is a sequence of 16-byte big-endian entries sorted by position
+key: key (8 bytes), move (2), weight (2) and a learning field (4). The
+file is memory-mapped and searched by bisection, so opening a book costs
+nothing up front and a lookup reads a handful of entries.
+
+A move packs the destination file and rank in bits 0-5, the origin in
+bits 6-11 and a promotion piece (1 knight ... 4 queen) in bits 12-14.
+Castling is written as the king taking its own rook, e.g. e1h1.
+"""
+import mmap
+import os
+import random
+import struct
+from Engine.bitboard import QUEEN, ROOK, BISHOP, KNIGHT
+from Engine.movegen import position_status
+from Engine.move import CASTLE, move_from, move_to, move_promotion
+from Engine.polyglot import polyglot_key
+from Engine.log import get_logger
+
+log = get_logger("book")
+
+ENTRY = struct.Struct(">QHHI")
+KEY = struct.Struct(">Q")
+
+# Polyglot promotion codes of the engine's piece types
+_PROMOTION_CODES = {KNIGHT: 1, BISHOP: 2, ROOK: 3, QUEEN: 4}
+# Square the king lands on, by the rook square a book castling move names
+_CASTLING_TARGETS = {7: 6, 0: 2, 63: 62, 56: 58}
+_CASTLING_ROOKS = {target: rook for rook, target in _CASTLING_TARGETS.items()}
+
+
+def encode_book_move(move):
+    """
+    Convert an encoded move into a Polyglot book move.
+
+    Args:
+        move (int): The encoded move.
+
+    Returns:
+        int: The 16-bit book move.
+    """
+    to_sq = move_to(move)
+    if move & CASTLE:
+        to_sq = _CASTLING_ROOKS[to_sq]
+    return to_sq | move_from(move) << 6 | _PROMOTION_CODES.get(move_promotion(move), 0) << 12
+
+
+class OpeningBook:
+    """A memory-mapped Polyglot book."""
+    def __init__(self, path):
+        """
+        Open a book.
+
+        Args:
+            path (str): The book file.
+        """
+        self.path = path
+        self.file = open(path, "rb")
+        size = os.fstat(self.file.fileno()).st_size
+        # An empty file cannot be mapped
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self.size = size // ENTRY.size
+
+    def __len__(self):
+        return self.size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Unmap and close the file."""
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.data = b""
+        self.size = 0
+        self.file.close()
+
+    def entries(self, key):
+        """
+        Find the book entries of a position key.
+
+        Args:
+            key (int): The Polyglot key.
+
+        Returns:
+            list: (book move, weight) pairs in file order.
+        """
+        data = self.data
+        lo, hi = 0, self.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if KEY.unpack_from(data, mid * ENTRY.size)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        found = []
+        while lo < self.size:
+            entry_key, move, weight, _ = ENTRY.unpack_from(data, lo * ENTRY.size)
+            if entry_key != key:
+                break
+            found.append((move, weight))
+            lo += 1
+        return found
+
+    def moves(self, position):
+        """
+        Get the book moves of a position.
+
+        Book moves are matched against the legal moves, so a key collision
+        can never produce an illegal move.
+
+        Args:
+            position (Bitboard): The position.
+
+        Returns:
+            list: (encoded move, weight) pairs.
+        """
+        entries = self.entries(polyglot_key(position))
+        if not entries:
+            return []
+        legal = {encode_book_move(move): move for move in position_status(position)[1]}
+        return [(legal[book_move], weight) for book_move, weight in entries if book_move in legal]
+
+    def choose(self, position, randomize=True):
+        """
+        Pick a book move for a position.
+
+        Args:
+            position (Bitboard): The position.
+            randomize (bool): Pick at random in proportion to the weights;
+                otherwise always pick the heaviest move.
+
+        Returns:
+            int: The encoded move, or None if the position is not in the book.
+        """
+        moves = [(move, weight) for move, weight in self.moves(position) if weight > 0]
+        if not moves:
+            return None
+        if not randomize:
+            return max(moves, key=lambda entry: entry[1])[0]
+        return random.choices([move for move, _ in moves], [weight for _, weight in moves])[0]
+
+
+def open_book(path):
+    """
+    Open a book if the file exists.
+
+    Args:
+        path (str): The book file, or None.
+
+    Returns:
+        OpeningBook: The book, or None if there is no such file.
+    """
+    if not path or not os.path.exists(path):
+        return None
+    log.info("Using opening book %s", path)
+    return OpeningBook(path)
+
+
+def write_book(path, entries):
+    """
+    Write a Polyglot book.
+
+    Args:
+        path (str): The file to write.
+        entries (iterable): (position key, encoded move, weight) triples, in any order.
+    """
+    with open(path, "wb") as file:
+        for key, move, weight in sorted(entries, key=lambda entry: entry[0]):
+            file.write(ENTRY.pack(key, encode_book_move(move), weight, 0))
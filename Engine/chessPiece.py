@@ -21,9 +21,23 @@ ChessPieceSprites = {
 }
 
 
+# Integer side of each colour name (the bitboard's WHITE and BLACK)
+COLOR_CODES = {"white": 0, "black": 1}
+
+
 # Base Class for Chess Pieces
 class ChessPiece:
-    """Base class for all chess pieces."""
+    """
+    Base class for all chess pieces.
+
+    The type is shared by the class (ID) rather than stored per piece, and
+    pieces use __slots__, so a board's 32 pieces stay small and quick to
+    copy. colorIndex and index are the integer side and bitboard piece
+    index (colorIndex * 6 + type), cached so board updates need no lookups.
+    """
+    __slots__ = ("color", "xGrid", "yGrid", "ChessBoard", "colorIndex", "index")
+    ID = ChessPieceType.INVALID
+
     def __init__(self, color, xGrid, yGrid, board):
         """
         Initialize a chess piece.
@@ -38,7 +52,8 @@ class ChessPiece:
         self.xGrid = xGrid
         self.yGrid = yGrid
         self.ChessBoard = board
-        self.ID = ChessPieceType.INVALID
+        self.colorIndex = COLOR_CODES[color]
+        self.index = self.colorIndex * 6 + self.ID.value
 
     def validMove(self):
         """Generate valid moves for the piece. To be implemented by subclasses."""
@@ -82,9 +97,9 @@ class ChessPiece:
         self.ChessBoard.moveStack.pushMove(self, (self.xGrid, self.yGrid), move, newMove)
 
         # Update piece position
-        self.ChessBoard.board[self.xGrid, self.yGrid] = None
+        self.ChessBoard.setSquare(self.xGrid, self.yGrid, None)
         self.xGrid, self.yGrid = move
-        self.ChessBoard.board[move[0], move[1]] = self
+        self.ChessBoard.setSquare(move[0], move[1], self)
 
 
         return True
@@ -1,9 +1,8 @@
 from Engine.chessPiece import *
 
 class Bishop(ChessPiece):
-    def __init__(self, color, xGrid, yGrid, board):
-        super().__init__(color, xGrid, yGrid, board)
-        self.ID = ChessPieceType.BISHOP
+    __slots__ = ()
+    ID = ChessPieceType.BISHOP
         
     def validMove(self):
         moves = []
@@ -1,10 +1,13 @@
 from Engine.chessPiece import *
+from Engine.bitboard import COLOR_INDEX, WHITE_KINGSIDE, WHITE_QUEENSIDE, square
+
+# Rook (from x, to x) keyed by the king's destination file when castling
+CASTLING_ROOK_X = {6: (7, 5), 2: (0, 3)}
 # King Class
 class King(ChessPiece):
     """Class representing the King piece."""
-    def __init__(self, color, xGrid, yGrid, board):
-        super().__init__(color, xGrid, yGrid, board)
-        self.ID = ChessPieceType.KING
+    __slots__ = ()
+    ID = ChessPieceType.KING
 
     def validMove(self):
         """Generate valid moves for the King."""
@@ -18,11 +21,11 @@ class King(ChessPiece):
                     if not self.BeExposedToCheck((nx, ny)):
                         moves.append((nx, ny))
 
-        # Add castling moves
+        # Add castling moves (the king steps two squares towards the rook)
         if self.CanCastle("left"):
-            moves.append((0, self.yGrid))
+            moves.append((2, self.yGrid))
         if self.CanCastle("right"):
-            moves.append((7, self.yGrid))
+            moves.append((6, self.yGrid))
         return moves
 
     def BeExposedToCheck(self, move):
@@ -36,52 +39,61 @@ class King(ChessPiece):
             bool: True if the King would be in check, False otherwise.
         """
         opponent = "black" if self.color == "white" else "white"
-        for row in self.ChessBoard.board:
-            for piece in row:
-                if piece and piece.color == opponent and piece.ID != ChessPieceType.KING:
-                    if move in piece.validMove():
-                        return True
-        return False
+        bitboard = self.ChessBoard.bitboard
+        if bitboard is None:
+            bitboard = self.ChessBoard.toBitboard()
+        # Lift the king off the board so it cannot block rays through its own square
+        occupied = bitboard.occupied & ~(1 << square(self.xGrid, self.yGrid))
+        return bitboard.is_square_attacked(square(*move), COLOR_INDEX[opponent], occupied)
 
     def CanCastle(self, direction):
         """
         Check if castling is possible.
 
         Args:
-            direction (str): 'left' or 'right'.
+            direction (str): 'left' (queenside) or 'right' (kingside).
 
         Returns:
             bool: True if castling is possible, False otherwise.
         """
+        home = 0 if self.color == "white" else 7
+        if self.xGrid != 4 or self.yGrid != home:
+            return False
         if direction == "left":
-            if (self.xGrid == 4 and self.yGrid == 0 and
-                self.ChessBoard.board[0, self.yGrid] and
-                self.ChessBoard.board[0, self.yGrid].ID == ChessPieceType.ROOK and
-                all(self.ChessBoard.board[i, self.yGrid] is None for i in range(1, 4))):
-                return not any(self.BeExposedToCheck((i, self.yGrid)) for i in range(5))
+            rookX, between, path, right = 0, range(1, 4), range(2, 5), WHITE_QUEENSIDE
         elif direction == "right":
-            if (self.xGrid == 4 and self.yGrid == 0 and
-                self.ChessBoard.board[7, self.yGrid] and
-                self.ChessBoard.board[7, self.yGrid].ID == ChessPieceType.ROOK and
-                all(self.ChessBoard.board[i, self.yGrid] is None for i in range(5, 7))):
-                return not any(self.BeExposedToCheck((i, self.yGrid)) for i in range(5, 8))
-        return False
+            rookX, between, path, right = 7, range(5, 7), range(4, 7), WHITE_KINGSIDE
+        else:
+            return False
+
+        bitboard = self.ChessBoard.bitboard
+        if bitboard is not None and not bitboard.castling & (right << (2 * COLOR_INDEX[self.color])):
+            return False
+        rook = self.ChessBoard.board[rookX, home]
+        if rook is None or rook.ID != ChessPieceType.ROOK or rook.color != self.color:
+            return False
+        if any(self.ChessBoard.board[i, home] is not None for i in between):
+            return False
+        return not any(self.BeExposedToCheck((i, home)) for i in path)
 
-    def move(self, move, castle=False, RecordCapture=True):
+    def move(self, move, RecordCapture=True):
         """
-        Move the King, handling castling if applicable.
+        Move the King, bringing the rook along when castling.
 
         Args:
             move (tuple): The target position (x, y).
-            castle (bool): Whether the move is a castling move.
             RecordCapture (bool): Whether to record captures.
 
         Returns:
             bool: True if the move was successful, False otherwise.
         """
-        if castle:
-            if move[0] == 0:  # Left castle
-                self.ChessBoard.board[0, self.yGrid].move((3, self.yGrid))
-            elif move[0] == 7:  # Right castle
-                self.ChessBoard.board[7, self.yGrid].move((5, self.yGrid))
-        return super().move(move, RecordCapture)
\ No newline at end of file
+        startX = self.xGrid
+        if not super().move(move, RecordCapture):
+            return False
+        if abs(move[0] - startX) == 2:
+            rookFrom, rookTo = CASTLING_ROOK_X[move[0]]
+            rook = self.ChessBoard.board[rookFrom, move[1]]
+            self.ChessBoard.setSquare(rookFrom, move[1], None)
+            rook.xGrid = rookTo
+            self.ChessBoard.setSquare(rookTo, move[1], rook)
+        return True
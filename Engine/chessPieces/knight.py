@@ -2,9 +2,8 @@ from Engine.chessPiece import *
 
 class Knight(ChessPiece):
     """Class representing the Knight piece."""
-    def __init__(self, color, xGrid, yGrid, board):
-        super().__init__(color, xGrid, yGrid, board)
-        self.ID = ChessPieceType.KNIGHT
+    __slots__ = ()
+    ID = ChessPieceType.KNIGHT
 
     def validMove(self):
         """
@@ -3,9 +3,11 @@ from Engine.chessPieces.queen import Queen
 
 class Pawn(ChessPiece):
     """Class representing the Pawn piece."""
+    __slots__ = ("movedTwoSpaces",)
+    ID = ChessPieceType.PAWN
+
     def __init__(self, color, xGrid, yGrid, board):
         super().__init__(color, xGrid, yGrid, board)
-        self.ID = ChessPieceType.PAWN
         self.movedTwoSpaces = False
 
     def validMove(self):
@@ -25,7 +27,8 @@ class Pawn(ChessPiece):
 
             # Move two spaces forward (only if the pawn hasn't moved yet)
             if (self.yGrid == 1 and self.color == "white") or (self.yGrid == 6 and self.color == "black"):
-                if self.ChessBoard.board[self.xGrid, self.yGrid + 2 * direction] is None:
+                if (self.ChessBoard.board[self.xGrid, self.yGrid + direction] is None and
+                        self.ChessBoard.board[self.xGrid, self.yGrid + 2 * direction] is None):
                     moves.append((self.xGrid, self.yGrid + 2 * direction))
 
             # Capture diagonally
@@ -41,10 +44,19 @@ class Pawn(ChessPiece):
                     #adjacent = self.ChessBoard.board[self.xGrid + dx, self.yGrid]
                     #if adjacent and adjacent.color != self.color and adjacent.ID == ChessPieceType.PAWN and adjacent.movedTwoSpaces:
                         #moves.append((self.xGrid + dx, self.yGrid + direction))
+            lastMove = self.ChessBoard.moveStack.getLastMove()
+            bitboard = self.ChessBoard.bitboard
             for dx in [-1, 1]:
                 if 0 <= self.xGrid + dx < 8:
                     if self.ChessBoard.board[self.xGrid + dx, self.yGrid] != None and self.ChessBoard.board[self.xGrid+dx, self.yGrid].color != self.color and self.ChessBoard.board[self.xGrid+dx, self.yGrid].ID == ChessPieceType.PAWN and self.ChessBoard.board[self.xGrid+dx, self.yGrid].movedTwoSpaces:
-                        moves.append((self.xGrid+dx, self.yGrid+direction))
+                        # Only straight after the double step. The bitboard keeps the
+                        # en passant square itself, so positions loaded from FEN or
+                        # copied without a move history still allow the capture.
+                        if bitboard is not None:
+                            if bitboard.ep_square == (self.yGrid + direction) * 8 + self.xGrid + dx:
+                                moves.append((self.xGrid+dx, self.yGrid+direction))
+                        elif lastMove is not None and lastMove[0] is self.ChessBoard.board[self.xGrid+dx, self.yGrid]:
+                            moves.append((self.xGrid+dx, self.yGrid+direction))
 
         return moves
 
@@ -65,23 +77,24 @@ class Pawn(ChessPiece):
         newMove = self.ChessBoard.board[move[0], move[1]]
         if newMove:
             self.ChessBoard.capture(newMove, RecordCapture)
-            self.ChessBoard.board[move[0], move[1]] = None
+            self.ChessBoard.setSquare(move[0], move[1], None)
         elif move[0] != self.xGrid:
             # En passant
-            self.ChessBoard.capture(self.ChessBoard.board[move[0], self.yGrid], RecordCapture)
-            self.ChessBoard.board[move[0], self.yGrid] = None
+            newMove = self.ChessBoard.board[move[0], self.yGrid]
+            self.ChessBoard.capture(newMove, RecordCapture)
+            self.ChessBoard.setSquare(move[0], self.yGrid, None)
 
         # Check if the pawn moved two spaces
         self.movedTwoSpaces = abs(move[1] - self.yGrid) == 2
 
         # Update the board and position
         self.ChessBoard.moveStack.pushMove(self, (self.xGrid, self.yGrid), move, newMove)
-        self.ChessBoard.board[self.xGrid, self.yGrid] = None
+        self.ChessBoard.setSquare(self.xGrid, self.yGrid, None)
         self.xGrid, self.yGrid = move
-        self.ChessBoard.board[move[0], move[1]] = self
+        self.ChessBoard.setSquare(move[0], move[1], self)
 
         # Handle promotion
         if (self.yGrid == 7 and self.color == "white") or (self.yGrid == 0 and self.color == "black"):
-            self.ChessBoard.board[self.xGrid, self.yGrid] = Queen(self.color, self.xGrid, self.yGrid, self.ChessBoard)
+            self.ChessBoard.setSquare(self.xGrid, self.yGrid, Queen(self.color, self.xGrid, self.yGrid, self.ChessBoard))
 
         return True
@@ -2,9 +2,8 @@ from Engine.chessPiece import *
 
 class Queen(ChessPiece):
     """Class representing the Queen piece."""
-    def __init__(self, color, xGrid, yGrid, board):
-        super().__init__(color, xGrid, yGrid, board)
-        self.ID = ChessPieceType.QUEEN
+    __slots__ = ()
+    ID = ChessPieceType.QUEEN
 
     def validMove(self):
         """
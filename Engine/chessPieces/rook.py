@@ -3,9 +3,8 @@ from Engine.chessPiece import *
 
 class Rook(ChessPiece):
     """Class representing the Rook piece."""
-    def __init__(self, color, xGrid, yGrid, board):
-        super().__init__(color, xGrid, yGrid, board)
-        self.ID = ChessPieceType.ROOK
+    __slots__ = ()
+    ID = ChessPieceType.ROOK
 
     def validMove(self):
         """
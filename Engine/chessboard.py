@@ -1,6 +1,4 @@
-import pygame
 import numpy as np
-import copy
 from Engine.moveStack import *
 from Engine.evaluation import *
 from Engine.chessPiece import *
@@ -10,40 +8,121 @@ from Engine.chessPieces.rook import Rook
 from Engine.chessPieces.pawn import Pawn
 from Engine.chessPieces.queen import Queen
 from Engine.chessPieces.king import King
+from Engine.bitboard import (Bitboard, ALL_CASTLING, COLOR_INDEX, WHITE_KINGSIDE,
+                             WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE,
+                             COLOR_NAMES, EMPTY, square, square_xy)
+from Engine.fen import parse_fen, to_fen
+
+# Storage backends selectable through Chessboard(backend=...)
+BACKENDS = ("object", "bitboard")
+DEFAULT_BACKEND = "bitboard"
+
+# Piece classes in ChessPieceType value order (KING..PAWN)
+PIECE_CLASSES = (King, Queen, Rook, Bishop, Knight, Pawn)
 
 class Chessboard:
     """Class representing the chessboard."""
-    def __init__(self):
+    def __init__(self, backend=DEFAULT_BACKEND):
+        """
+        Initialize an empty chessboard.
+
+        Args:
+            backend (str): 'object' to scan the piece grid, or 'bitboard' to
+                also keep piece masks in sync for fast lookups.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown board backend: {backend}")
+        self.backend = backend
         self.moveStack = moveStack(self)
         self.board = np.empty((8, 8), dtype=object)
+        self.bitboard = Bitboard() if backend == "bitboard" else None
+        # Check state and legal moves by position hash, shared by every position
+        # toBitboard returns (see movegen.position_status)
+        self.statusCache = self.bitboard.status_cache if self.bitboard is not None else {}
         self.captured = []
         self.Evaluator = Evaluator()
+        # Each side's pieces by (x, y) and each side's king, kept in step with the grid
+        self.pieceLists = {"white": {}, "black": {}}
+        self.kings = {"white": None, "black": None}
 
     def SetUpBoard(self):
         """Set up the initial positions of all chess pieces on the board."""
         for i in range(8):
-            self.board[i, 1] = Pawn("white", i, 1, self)
-            self.board[i, 6] = Pawn("black", i, 6, self)
+            self.setSquare(i, 1, Pawn("white", i, 1, self))
+            self.setSquare(i, 6, Pawn("black", i, 6, self))
 
-        self.board[0, 0] = Rook("white", 0, 0, self)
-        self.board[7, 0] = Rook("white", 7, 0, self)
-        self.board[0, 7] = Rook("black", 0, 7, self)
-        self.board[7, 7] = Rook("black", 7, 7, self)
+        self.setSquare(0, 0, Rook("white", 0, 0, self))
+        self.setSquare(7, 0, Rook("white", 7, 0, self))
+        self.setSquare(0, 7, Rook("black", 0, 7, self))
+        self.setSquare(7, 7, Rook("black", 7, 7, self))
 
-        self.board[1, 0] = Knight("white", 1, 0, self)
-        self.board[6, 0] = Knight("white", 6, 0, self)
-        self.board[1, 7] = Knight("black", 1, 7, self)
-        self.board[6, 7] = Knight("black", 6, 7, self)
+        self.setSquare(1, 0, Knight("white", 1, 0, self))
+        self.setSquare(6, 0, Knight("white", 6, 0, self))
+        self.setSquare(1, 7, Knight("black", 1, 7, self))
+        self.setSquare(6, 7, Knight("black", 6, 7, self))
 
-        self.board[2, 0] = Bishop("white", 2, 0, self)
-        self.board[5, 0] = Bishop("white", 5, 0, self)
-        self.board[2, 7] = Bishop("black", 2, 7, self)
-        self.board[5, 7] = Bishop("black", 5, 7, self)
+        self.setSquare(2, 0, Bishop("white", 2, 0, self))
+        self.setSquare(5, 0, Bishop("white", 5, 0, self))
+        self.setSquare(2, 7, Bishop("black", 2, 7, self))
+        self.setSquare(5, 7, Bishop("black", 5, 7, self))
 
-        self.board[3, 0] = Queen("white", 3, 0, self)
-        self.board[4, 0] = King("white", 4, 0, self)
-        self.board[3, 7] = Queen("black", 3, 7, self)
-        self.board[4, 7] = King("black", 4, 7, self)
+        self.setSquare(3, 0, Queen("white", 3, 0, self))
+        self.setSquare(4, 0, King("white", 4, 0, self))
+        self.setSquare(3, 7, Queen("black", 3, 7, self))
+        self.setSquare(4, 7, King("black", 4, 7, self))
+
+        if self.bitboard is not None:
+            self.bitboard.castling = ALL_CASTLING
+            self.bitboard.rehash()
+
+    def setSquare(self, x, y, piece):
+        """
+        Write a square of the board, keeping the bitboards in sync.
+
+        Args:
+            x (int): The x-coordinate on the board.
+            y (int): The y-coordinate on the board.
+            piece (ChessPiece): The piece to place, or None to empty the square.
+        """
+        old = self.board[x, y]
+        if old is not None:
+            self.untrack(x, y, old)
+        if piece is not None:
+            self.track(x, y, piece)
+        if self.bitboard is not None:
+            sq = square(x, y)
+            if old is not None:
+                self.bitboard.remove_piece(sq, old.index)
+            if piece is not None:
+                self.bitboard.put_piece(sq, piece.index)
+        self.board[x, y] = piece
+
+    def track(self, x, y, piece):
+        """Add a piece placed on a square to its side's piece list."""
+        self.pieceLists[piece.color][x, y] = piece
+        if piece.ID == ChessPieceType.KING:
+            self.kings[piece.color] = piece
+
+    def untrack(self, x, y, piece):
+        """Drop a piece leaving a square from its side's piece list."""
+        pieceList = self.pieceLists[piece.color]
+        del pieceList[x, y]
+        # Undoing a move puts the piece back before its destination is cleared
+        if self.kings[piece.color] is piece and pieceList.get((piece.xGrid, piece.yGrid)) is not piece:
+            self.kings[piece.color] = None
+
+    def pieces(self, color):
+        """
+        Iterate over the pieces of one side.
+
+        Args:
+            color (str): The color of the pieces ('white' or 'black').
+
+        Yields:
+            ChessPiece: Each piece of that color on the board.
+        """
+        # Copy the list so moves can be tried while iterating
+        yield from list(self.pieceLists[color].values())
 
     def find(self, pieceType, color):
         """
@@ -56,40 +135,21 @@ class Chessboard:
         Returns:
             ChessPiece: The found piece, or None if not found.
         """
-        for row in self.board:
-            for piece in row:
-                if piece and piece.ID == pieceType and piece.color == color:
-                    return piece
+        if pieceType == ChessPieceType.KING:
+            return self.kings[color]
+        if self.bitboard is not None:
+            sq = self.bitboard.find(pieceType, COLOR_INDEX[color])
+            return None if sq is None else self.board[sq & 7, sq >> 3]
+        for piece in self.pieceLists[color].values():
+            if piece.ID == pieceType:
+                return piece
         return None
+
     def remove(self, piece):
-        self.board[piece.xGrid, piece.yGrid] = None
+        self.setSquare(piece.xGrid, piece.yGrid, None)
         
     def add(self, piece):
-        self.board[piece.xGrid, piece.yGrid] = piece
-
-    def render(self, screen):
-        """
-        Render the chessboard and pieces on the screen.
-
-        Args:
-            screen (pygame.Surface): The screen to render on.
-        """
-        screen.fill((255, 255, 255))
-        cell_size = 75
-        boardColor = [(255, 255, 255), (30, 0, 100)]
-
-        for x, col in enumerate(self.board):
-            for y, piece in enumerate(col):
-                rect = pygame.Rect(x * cell_size, y * cell_size, cell_size, cell_size)
-                color = boardColor[(x + y) % 2]
-                pygame.draw.rect(screen, color, rect)
-                if piece:
-                    sprite_link = ChessPieceSprites.get(piece.ID) + "_" + piece.color + ".png"
-                    if sprite_link:
-                        sprite = pygame.image.load(sprite_link).convert_alpha()
-                        pos_x = x * 75 + 5
-                        pos_y = y * 75 + 5
-                        screen.blit(sprite, (pos_x, pos_y))
+        self.setSquare(piece.xGrid, piece.yGrid, piece)
 
     def capture(self, piece, RecordCapture=True):
         """
@@ -109,38 +169,10 @@ class Chessboard:
         Returns:
             int: The evaluation score of the board.
         """
+        if self.bitboard is not None:
+            return self.Evaluator.evaluate_bitboard(self.bitboard)
         return self.Evaluator.evaluate(self.board)
     
-    def renderCapturedPieces(self, screen):
-        """
-        Render the captured pieces on the screen.
-
-        Args:
-            screen (pygame.Surface): The screen to render on.
-        """
-        white_captured = [piece for piece in self.captured if piece.color == "white"]
-        black_captured = [piece for piece in self.captured if piece.color == "black"]
-
-        # Render white captured pieces
-        for i, piece in enumerate(white_captured):
-            sprite_link = ChessPieceSprites.get(piece.ID) + "_white.png"
-            if sprite_link:
-                sprite = pygame.image.load(sprite_link).convert_alpha()
-                screen.blit(sprite, (600 + i * 40, 650))  
-
-        # Render black captured pieces
-        for i, piece in enumerate(black_captured):
-            sprite_link = ChessPieceSprites.get(piece.ID) + "_black.png"
-            if sprite_link:
-                sprite = pygame.image.load(sprite_link).convert_alpha()
-                screen.blit(sprite, (600 + i * 40, 700))  
-    def renderValidSquares(self, screen, moves):
-        cell_size = 75
-        for move in moves:
-            x, y = move
-            rect = pygame.Rect(x * cell_size, y * cell_size, cell_size, cell_size)
-            pygame.draw.rect(screen, (0, 255, 0), rect)
-
     def makeMove(self, piece, newLoc, updateCapture=True):
         """
         Make a move on the chessboard.
@@ -161,58 +193,119 @@ class Chessboard:
         """
         self.moveStack.undoMove(updateCapture)
 
-    def evaluate(self):
+    def toBitboard(self):
         """
-        Evaluate the current board state.
+        Get a bitboard position for the current board, e.g. to search on.
+
+        The bitboard backend returns a copy of its own masks. The object
+        backend builds one from the grid, inferring castling rights from
+        king and rook placement and en passant from the last move.
 
         Returns:
-            int: The evaluation score of the board.
+            Bitboard: A position independent of this board.
         """
-        return self.Evaluator.evaluate(self.board)
-    
-    def remove(self, piece):
-        self.board[piece.xGrid, piece.yGrid] = None
-        
-    def add(self, piece):
-        self.board[piece.xGrid, piece.yGrid] = piece
+        if self.bitboard is not None:
+            return self.bitboard.copy()
+
+        position = Bitboard()
+        for color, pieceList in self.pieceLists.items():
+            for (x, y), piece in pieceList.items():
+                position.put_piece(square(x, y), piece.index)
+
+        for color, home, kingside, queenside in (("white", 0, WHITE_KINGSIDE, WHITE_QUEENSIDE),
+                                                 ("black", 7, BLACK_KINGSIDE, BLACK_QUEENSIDE)):
+            king = self.board[4, home]
+            if king is None or king.ID != ChessPieceType.KING or king.color != color:
+                continue
+            for rookX, right in ((7, kingside), (0, queenside)):
+                rook = self.board[rookX, home]
+                if rook is not None and rook.ID == ChessPieceType.ROOK and rook.color == color:
+                    position.castling |= right
+
+        lastMove = self.moveStack.getLastMove()
+        if lastMove is not None:
+            piece, start_pos, end_pos, _ = lastMove
+            position.side = COLOR_INDEX[piece.color] ^ 1
+            if piece.ID == ChessPieceType.PAWN and abs(end_pos[1] - start_pos[1]) == 2:
+                position.ep_square = square(start_pos[0], (start_pos[1] + end_pos[1]) // 2)
+        position.rehash()
+        position.status_cache = self.statusCache
+        return position
+
+    @classmethod
+    def from_fen(cls, fen, backend=DEFAULT_BACKEND):
+        """
+        Create a board holding the position of a FEN string.
+
+        Side to move, castling rights, en passant square and move counters
+        are kept by the bitboard backend; the object backend infers them
+        from the grid, as toBitboard describes.
+
+        Args:
+            fen (str): The FEN string.
+            backend (str): The storage backend, as for __init__.
+
+        Returns:
+            Chessboard: The new board.
+        """
+        position = parse_fen(fen)
+        board = cls(backend)
+        for sq, index in enumerate(position.mailbox):
+            if index != EMPTY:
+                x, y = square_xy(sq)
+                board.setSquare(x, y, PIECE_CLASSES[index % 6](COLOR_NAMES[index // 6], x, y, board))
+
+        if position.ep_square >= 0:
+            # The pawn that just double-stepped stands behind the en passant square
+            x, y = square_xy(position.ep_square ^ 8)
+            if isinstance(board.board[x, y], Pawn):
+                board.board[x, y].movedTwoSpaces = True
+        if board.bitboard is not None:
+            board.bitboard.side = position.side
+            board.bitboard.castling = position.castling
+            board.bitboard.ep_square = position.ep_square
+            board.bitboard.halfmove = position.halfmove
+            board.bitboard.fullmove = position.fullmove
+            board.bitboard.rehash()
+        return board
+
+    def to_fen(self):
+        """
+        Write the current position as a FEN string.
+
+        Returns:
+            str: The FEN string.
+        """
+        return to_fen(self.toBitboard())
 
     def copy(self):
         """
-        Create a deep copy of the chessboard.
+        Create a copy of the chessboard with its own pieces.
+
+        The pieces are cloned from the piece lists and the bitboard is
+        restored from a snapshot; captured pieces are off the board and are
+        shared. The copy starts with an empty move stack, so en passant
+        rights carry over through the bitboard's en passant square; the
+        object backend has no such square and loses them.
 
         Returns:
-            Chessboard: A new Chessboard instance with the same state.
+            Chessboard: A new Chessboard instance with the same position.
         """
-        new_board = Chessboard()
+        new_board = Chessboard(self.backend)
 
-        new_board.board = np.empty((8, 8), dtype=object)
-        
-        for x in range(8):
-            for y in range(8):
-                if self.board[x, y] is not None:
-                    original_piece = self.board[x, y]
-                    
-                    # Create new piece of the same type
-                    if original_piece.ID == ChessPieceType.PAWN:
-                        new_piece = Pawn(original_piece.color, x, y, new_board)
-                        new_piece.movedTwoSpaces = original_piece.movedTwoSpaces
-                    elif original_piece.ID == ChessPieceType.ROOK:
-                        new_piece = Rook(original_piece.color, x, y, new_board)
-                    elif original_piece.ID == ChessPieceType.KNIGHT:
-                        new_piece = Knight(original_piece.color, x, y, new_board)
-                    elif original_piece.ID == ChessPieceType.BISHOP:
-                        new_piece = Bishop(original_piece.color, x, y, new_board)
-                    elif original_piece.ID == ChessPieceType.QUEEN:
-                        new_piece = Queen(original_piece.color, x, y, new_board)
-                    elif original_piece.ID == ChessPieceType.KING:
-                        new_piece = King(original_piece.color, x, y, new_board)
-                    
-                    new_board.board[x, y] = new_piece
-                else:
-                    new_board.board[x, y] = None
-
-        new_board.captured = copy.deepcopy(self.captured)
+        for pieceList in self.pieceLists.values():
+            for (x, y), piece in pieceList.items():
+                new_piece = type(piece)(piece.color, x, y, new_board)
+                if piece.ID == ChessPieceType.PAWN:
+                    new_piece.movedTwoSpaces = piece.movedTwoSpaces
+                new_board.board[x, y] = new_piece
+                new_board.track(x, y, new_piece)
+
+        if self.bitboard is not None:
+            new_board.bitboard.restore(self.bitboard.snapshot())
+            new_board.bitboard.status_cache = self.statusCache
+        new_board.statusCache = self.statusCache
+        new_board.captured = list(self.captured)
         new_board.Evaluator = self.Evaluator
-        new_board.moveStack = moveStack(new_board)
 
         return new_board
\ No newline at end of file
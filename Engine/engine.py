@@ -0,0 +1,152 @@
+"""
+Headless engine API.
+
+Holds a bitboard position and a search, with no piece objects and no
+pygame, so servers and tools can load the engine without a display. Moves
+are the encoded integers of Engine.move; UCI strings such as "e2e4" or
+"e7e8q" are accepted wherever a move is expected.
+"""
+from Engine.bitboard import start_position
+from Engine.movegen import position_status
+from Engine.move import move_to_uci
+from Engine.fen import parse_fen, to_fen
+from Engine.AI.minmax import MinMax
+from Engine.AI.transposition import DEFAULT_SIZE_MB
+from Engine.book import open_book
+
+DEFAULT_DEPTH = 8
+
+
+class ChessEngine:
+    """A position plus the search to play from it."""
+    def __init__(self, depth=DEFAULT_DEPTH, hash_mb=DEFAULT_SIZE_MB, time_limit=None,
+                 node_limit=None, workers=1, book_path=None):
+        """
+        Initialize the engine at the starting position.
+
+        Args:
+            depth (int): Maximum search depth in plies.
+            hash_mb (float): Transposition table budget in megabytes.
+            time_limit (float): Default seconds per search, or None for no limit.
+            node_limit (int): Default nodes per search, or None for no limit.
+            workers (int): Processes to split the search across.
+            book_path (str): Polyglot opening book to play from, if the file exists.
+        """
+        self.searcher = MinMax(None, None, depth, hash_mb, time_limit, node_limit,
+                               randomize=False, workers=workers, book=open_book(book_path))
+        self.position = start_position()
+        self.moves = []
+
+    def close(self):
+        """Release the search's worker processes and opening book."""
+        self.searcher.close()
+
+    def reset(self, position=None):
+        """
+        Start over from a position, keeping the transposition table.
+
+        Args:
+            position (Bitboard): The new position; defaults to the starting position.
+        """
+        self.position = position if position is not None else start_position()
+        self.moves = []
+
+    def set_fen(self, fen):
+        """
+        Start over from a FEN position, keeping the transposition table.
+
+        Args:
+            fen (str): The FEN string.
+        """
+        self.reset(parse_fen(fen))
+
+    def fen(self):
+        """
+        Get the current position as a FEN string.
+
+        Returns:
+            str: The FEN string.
+        """
+        return to_fen(self.position)
+
+    def legal_moves(self):
+        """
+        Get the legal moves of the side to move.
+
+        Returns:
+            list: Encoded legal moves.
+        """
+        return position_status(self.position)[1].copy()
+
+    def parse_move(self, text):
+        """
+        Find the legal move written in UCI notation.
+
+        Args:
+            text (str): The move, e.g. "e2e4" or "e7e8q".
+
+        Returns:
+            int: The encoded move.
+
+        Raises:
+            ValueError: If no legal move matches.
+        """
+        text = text.strip().lower()
+        for move in self.legal_moves():
+            if move_to_uci(move) == text:
+                return move
+        raise ValueError(f"Illegal move: {text}")
+
+    def make_move(self, move):
+        """
+        Play a move.
+
+        Args:
+            move (int or str): An encoded legal move or its UCI string.
+
+        Returns:
+            int: The encoded move played.
+        """
+        if isinstance(move, str):
+            move = self.parse_move(move)
+        self.position.make_move(move)
+        self.moves.append(move)
+        return move
+
+    def unmake_move(self):
+        """
+        Take back the last move played.
+
+        Returns:
+            int: The encoded move taken back.
+        """
+        move = self.moves.pop()
+        self.position.unmake_move(move)
+        return move
+
+    def in_check(self):
+        """Whether the side to move is in check."""
+        return position_status(self.position)[0]
+
+    def search(self, depth=None, time_limit=None, node_limit=None):
+        """
+        Search the current position for the best move.
+
+        Args:
+            depth (int): Maximum depth for this search; defaults to the engine's.
+            time_limit (float): Seconds to search; defaults to the engine's.
+            node_limit (int): Nodes to search; defaults to the engine's.
+
+        Returns:
+            int: The best encoded move, or None if there are no legal moves.
+        """
+        legal_moves = self.legal_moves()
+        if not legal_moves:
+            return None
+        max_depth = self.searcher.depth
+        if depth is not None:
+            self.searcher.depth = depth
+        try:
+            return self.searcher.search(self.position, legal_moves, time_limit, node_limit)
+        finally:
+            self.searcher.depth = max_depth
@@ -1,4 +1,5 @@
 from enum import Enum
+import numpy as np
 
 class ChessPieceType(Enum):
     
@@ -95,7 +96,44 @@ piece_square_tables = {
     "QUEEN": queen_table,
     "KING": king_table
 }
-  
+
+# Integer centipawns per evaluation unit (PieceValue has a pawn worth 10)
+CENTIPAWNS = 10
+
+def _square_values(name, mult):
+    """Material plus half the positional bonus in centipawns for each square index (a1 = 0)."""
+    table = piece_square_tables[name]
+    return [mult * (PieceValue[name] * CENTIPAWNS + table[sq & 7][sq >> 3] * CENTIPAWNS // 2)
+            for sq in range(64)]
+
+# PIECE_SQUARE_VALUES[piece index][square]: signed contribution to the score,
+# indexed like the bitboards (white KING..PAWN, then black KING..PAWN)
+PIECE_SQUARE_VALUES = [_square_values(ChessPieceType(index % 6).name, 1 if index < 6 else -1)
+                       for index in range(12)]
+# Same values as a (13, 64) array; row 12 stands for an empty square
+PIECE_SQUARE_ARRAY = np.array(PIECE_SQUARE_VALUES + [[0] * 64], dtype=np.int64)
+
+
+def score_position(pieces):
+    """
+    Sum the centipawn score of a set of piece bitboards from scratch.
+
+    Args:
+        pieces (list): Twelve piece bitboards, indexed like PIECE_SQUARE_VALUES.
+
+    Returns:
+        int: The score in centipawns, positive when white is better.
+    """
+    score = 0
+    for index, bb in enumerate(pieces):
+        values = PIECE_SQUARE_VALUES[index]
+        while bb:
+            lsb = bb & -bb
+            score += values[lsb.bit_length() - 1]
+            bb ^= lsb
+    return score
+
+
 class Evaluator():
     def __init__(self):
         pass
@@ -116,4 +154,46 @@ class Evaluator():
                     
         # Weight material more heavily than position
         current_score = material_balance + (positional_score * 0.5)
-        return current_score
\ No newline at end of file
+        return current_score
+
+    def evaluate_bitboard(self, bitboard):
+        """
+        Evaluate a bitboard position in O(1) from its incrementally kept score.
+
+        Args:
+            bitboard (Bitboard): The position to evaluate.
+
+        Returns:
+            float: The same score evaluate() gives for the equivalent grid.
+        """
+        return bitboard.score / CENTIPAWNS
+
+    def evaluate_batch(self, positions):
+        """
+        Evaluate many positions in one vectorized pass.
+
+        Two encodings are accepted, both indexed by square (a1 = 0, h8 = 63):
+
+        - (N, 64) piece indices as in Bitboard.mailbox (white KING..PAWN
+          = 0-5, black = 6-11); anything else is an empty square, e.g.
+          ``np.array([bb.mailbox for bb in boards], dtype=np.int8)``.
+        - (N, 12, 64) piece planes, nonzero where that piece stands.
+
+        Args:
+            positions (np.ndarray): The encoded positions.
+
+        Returns:
+            np.ndarray: N float scores, each equal to what evaluate() gives
+                for the same board.
+        """
+        positions = np.asarray(positions)
+        if positions.ndim == 3 and positions.shape[1:] == (12, 64):
+            planes = (positions != 0).astype(np.int64)
+            centipawns = np.einsum('nps,ps->n', planes, PIECE_SQUARE_ARRAY[:12])
+        elif positions.ndim == 2 and positions.shape[1] == 64:
+            indices = positions.astype(np.intp)
+            indices = np.where((indices >= 0) & (indices < 12), indices, 12)
+            centipawns = PIECE_SQUARE_ARRAY[indices, np.arange(64)].sum(axis=1)
+        else:
+            raise ValueError(f"Expected an (N, 64) or (N, 12, 64) array, got shape {positions.shape}")
+        return centipawns / CENTIPAWNS
@@ -0,0 +1,234 @@
+"""
+FEN and EPD reading and writing for bitboard positions.
+
+parse_fen fills the bitboards, mailbox, Zobrist key and score directly
+instead of going through put_piece, one rank at a time. Ranks are memoized:
+most ranks of real positions (empty ranks, unmoved pawns, back ranks)
+recur, so large position files mostly cost a few dictionary lookups per
+position.
+"""
+from Engine.bitboard import (Bitboard, WHITE, BLACK, EMPTY, NO_SQUARE, WHITE_KINGSIDE,
+                             WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE)
+from Engine.zobrist import PIECE_KEYS, SIDE_KEY, CASTLING_KEYS, EP_KEYS
+from Engine.evaluation import PIECE_SQUARE_VALUES
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+# Piece letters in piece index order (white KING..PAWN, then black)
+PIECE_SYMBOLS = "KQRBNPkqrbnp"
+SYMBOL_INDEX = {symbol: index for index, symbol in enumerate(PIECE_SYMBOLS)}
+CASTLING_SYMBOLS = ((WHITE_KINGSIDE, "K"), (WHITE_QUEENSIDE, "Q"),
+                    (BLACK_KINGSIDE, "k"), (BLACK_QUEENSIDE, "q"))
+CASTLING_RIGHTS = {symbol: right for right, symbol in CASTLING_SYMBOLS}
+FILES = "abcdefgh"
+
+
+# Parsed ranks keyed by rank text, one table per rank; the same ranks recur across positions
+_rank_caches = [{} for _ in range(8)]
+RANK_CACHE_SIZE = 1 << 14
+
+
+def _parse_rank(text, y):
+    """
+    Parse one rank of a FEN placement field and memoize it.
+
+    Args:
+        text (str): The rank, e.g. "r1bqkb1r".
+        y (int): The rank number, 0 for white's back rank.
+
+    Returns:
+        tuple: (8 mailbox entries, ((piece index, bitboard), ...), white
+            occupancy, black occupancy, Zobrist key, score).
+    """
+    squares = [EMPTY] * 8
+    bits = {}
+    occupancy = [0, 0]
+    key = 0
+    score = 0
+    x = 0
+    for char in text:
+        if "1" <= char <= "8":
+            x += int(char)
+            continue
+        if char not in SYMBOL_INDEX or x > 7:
+            raise ValueError(f"Invalid FEN rank: {text!r}")
+        index = SYMBOL_INDEX[char]
+        sq = y * 8 + x
+        squares[x] = index
+        bits[index] = bits.get(index, 0) | (1 << sq)
+        occupancy[index >= 6] |= 1 << sq
+        key ^= PIECE_KEYS[index][sq]
+        score += PIECE_SQUARE_VALUES[index][sq]
+        x += 1
+    if x != 8:
+        raise ValueError(f"Invalid FEN rank: {text!r}")
+    entry = (bytes(squares), tuple(bits.items()), occupancy[0], occupancy[1], key, score)
+    cache = _rank_caches[y]
+    if len(cache) >= RANK_CACHE_SIZE:
+        cache.clear()
+    cache[text] = entry
+    return entry
+
+
+def parse_fen(fen):
+    """
+    Build a position from a FEN string.
+
+    The halfmove and fullmove fields may be left out, as in EPD.
+
+    Args:
+        fen (str): The FEN string.
+
+    Returns:
+        Bitboard: The position.
+
+    Raises:
+        ValueError: If the string is not valid FEN.
+    """
+    fields = fen.split()
+    if len(fields) < 4:
+        raise ValueError(f"Invalid FEN (expected at least 4 fields): {fen!r}")
+    placement, side, castling, ep = fields[:4]
+
+    ranks = placement.split("/")
+    if len(ranks) != 8:
+        raise ValueError(f"Invalid FEN placement: {placement!r}")
+    position = Bitboard()
+    pieces = position.pieces
+    mailbox = position.mailbox
+    white = black = key = score = 0
+    for y in range(8):
+        text = ranks[7 - y]
+        entry = _rank_caches[y].get(text)
+        if entry is None:
+            entry = _parse_rank(text, y)
+        squares, bits, rank_white, rank_black, rank_key, rank_score = entry
+        mailbox[y * 8:y * 8 + 8] = squares
+        for index, bb in bits:
+            pieces[index] |= bb
+        white |= rank_white
+        black |= rank_black
+        key ^= rank_key
+        score += rank_score
+    position.occupancy = [white, black]
+    position.occupied = white | black
+
+    if side == "w":
+        position.side = WHITE
+    elif side == "b":
+        position.side = BLACK
+        key ^= SIDE_KEY
+    else:
+        raise ValueError(f"Invalid FEN side to move: {side!r}")
+
+    if castling != "-":
+        rights = 0
+        for char in castling:
+            if char not in CASTLING_RIGHTS:
+                raise ValueError(f"Invalid FEN castling rights: {castling!r}")
+            rights |= CASTLING_RIGHTS[char]
+        position.castling = rights
+        key ^= CASTLING_KEYS[rights]
+
+    if ep != "-":
+        if len(ep) != 2 or ep[0] not in FILES or ep[1] not in "36":
+            raise ValueError(f"Invalid FEN en passant square: {ep!r}")
+        file = FILES.index(ep[0])
+        position.ep_square = (int(ep[1]) - 1) * 8 + file
+        key ^= EP_KEYS[file]
+
+    if len(fields) >= 6:
+        position.halfmove = int(fields[4])
+        position.fullmove = int(fields[5])
+
+    position.hash = key
+    position.score = score
+    return position
+
+
+def to_fen(position):
+    """
+    Write a position as a FEN string.
+
+    Args:
+        position (Bitboard): The position.
+
+    Returns:
+        str: The FEN string.
+    """
+    mailbox = position.mailbox
+    ranks = []
+    for y in range(7, -1, -1):
+        rank = ""
+        empty = 0
+        for sq in range(y * 8, y * 8 + 8):
+            index = mailbox[sq]
+            if index == EMPTY:
+                empty += 1
+                continue
+            if empty:
+                rank += str(empty)
+                empty = 0
+            rank += PIECE_SYMBOLS[index]
+        if empty:
+            rank += str(empty)
+        ranks.append(rank)
+
+    castling = "".join(symbol for right, symbol in CASTLING_SYMBOLS if position.castling & right)
+    if position.ep_square == NO_SQUARE:
+        ep = "-"
+    else:
+        ep = FILES[position.ep_square & 7] + str((position.ep_square >> 3) + 1)
+    return (f"{'/'.join(ranks)} {'wb'[position.side]} {castling or '-'} {ep} "
+            f"{position.halfmove} {position.fullmove}")
+
+
+def parse_epd(line):
+    """
+    Parse one EPD record: four FEN fields followed by opcodes.
+
+    Operations are separated by semicolons, e.g.
+    ``... w - - bm Qxf7+; id "WAC.001";``. Quoted operands are unquoted.
+
+    Args:
+        line (str): The EPD line.
+
+    Returns:
+        tuple: (Bitboard, dict of opcode to operand string).
+    """
+    fields = line.split(None, 4)
+    if len(fields) < 4:
+        raise ValueError(f"Invalid EPD record: {line!r}")
+    position = parse_fen(" ".join(fields[:4]))
+    operations = {}
+    if len(fields) == 5:
+        for operation in fields[4].split(";"):
+            operation = operation.strip()
+            if not operation:
+                continue
+            opcode, _, operand = operation.partition(" ")
+            operations[opcode] = operand.strip().strip('"')
+        if "hmvc" in operations:
+            position.halfmove = int(operations["hmvc"])
+        if "fmvn" in operations:
+            position.fullmove = int(operations["fmvn"])
+    return position, operations
+
+
+def load_epd(path):
+    """
+    Load every record of an EPD file, skipping blank and comment lines.
+
+    Args:
+        path (str): The file to read.
+
+    Returns:
+        list: (Bitboard, operations) tuples as returned by parse_epd.
+    """
+    records = []
+    with open(path) as file:
+        for line in file:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                records.append(parse_epd(line))
+    return records
@@ -0,0 +1,156 @@
+"""
+Leveled logging and an in-memory trace buffer for the engine.
+
+Built on the standard logging module under the "chessbot" logger. Nothing
+is printed unless configure() (or the application) sets a level, and hot
+paths check a level once up front (see is_enabled) so disabled messages
+cost neither a call nor any string formatting.
+
+The trace buffer keeps the most recent records in memory without writing
+them anywhere, to be dumped after something goes wrong:
+
+    enable_trace(capacity=50000, level=TRACE)
+    ...
+    print("\\n".join(dump_trace()))
+"""
+import collections
+import logging
+
+# Finer than DEBUG: one message per search node
+TRACE = 5
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+WARNING = logging.WARNING
+ERROR = logging.ERROR
+logging.addLevelName(TRACE, "TRACE")
+
+ROOT_NAME = "chessbot"
+DEFAULT_TRACE_CAPACITY = 10000
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+
+class TraceBuffer(logging.Handler):
+    """Logging handler that keeps the last records in a ring buffer."""
+    def __init__(self, capacity=DEFAULT_TRACE_CAPACITY, level=TRACE):
+        """
+        Initialize the buffer.
+
+        Args:
+            capacity (int): Records kept; older ones are dropped.
+            level (int): Lowest level recorded.
+        """
+        super().__init__(level)
+        self.records = collections.deque(maxlen=capacity)
+        self.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def dump(self):
+        """
+        Format the buffered records, oldest first.
+
+        Returns:
+            list: One string per record.
+        """
+        return [self.format(record) for record in list(self.records)]
+
+    def clear(self):
+        """Drop every buffered record."""
+        self.records.clear()
+
+
+_trace_buffer = None
+
+
+def get_logger(name):
+    """
+    Get the logger of an engine component.
+
+    Args:
+        name (str): Component name, e.g. "search".
+
+    Returns:
+        logging.Logger: The "chessbot.<name>" logger.
+    """
+    return logging.getLogger(f"{ROOT_NAME}.{name}")
+
+
+def is_enabled(logger, level):
+    """
+    Check once, before a hot loop, whether messages of a level would go anywhere.
+
+    Args:
+        logger (logging.Logger): The logger.
+        level (int): The message level.
+
+    Returns:
+        bool: True if the logger would handle the level.
+    """
+    return logger.isEnabledFor(level)
+
+
+def configure(level=INFO, stream=None):
+    """
+    Print engine messages of a level and above.
+
+    Args:
+        level (int): Lowest level printed.
+        stream (file): Where to print; defaults to stderr.
+    """
+    root = logging.getLogger(ROOT_NAME)
+    for handler in list(root.handlers):
+        if not isinstance(handler, TraceBuffer):
+            root.removeHandler(handler)
+    handler = logging.StreamHandler(stream)
+    handler.setLevel(level)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    root.addHandler(handler)
+    _update_level()
+
+
+def enable_trace(capacity=DEFAULT_TRACE_CAPACITY, level=TRACE):
+    """
+    Start recording engine messages into the in-memory trace buffer.
+
+    Args:
+        capacity (int): Records kept; older ones are dropped.
+        level (int): Lowest level recorded.
+
+    Returns:
+        TraceBuffer: The buffer.
+    """
+    global _trace_buffer
+    disable_trace()
+    _trace_buffer = TraceBuffer(capacity, level)
+    logging.getLogger(ROOT_NAME).addHandler(_trace_buffer)
+    _update_level()
+    return _trace_buffer
+
+
+def disable_trace():
+    """Stop recording into the trace buffer and discard it."""
+    global _trace_buffer
+    if _trace_buffer is not None:
+        logging.getLogger(ROOT_NAME).removeHandler(_trace_buffer)
+        _trace_buffer = None
+        _update_level()
+
+
+def dump_trace():
+    """
+    Get the contents of the trace buffer.
+
+    Returns:
+        list: Formatted records, oldest first; empty if tracing is off.
+    """
+    return _trace_buffer.dump() if _trace_buffer is not None else []
+
+
+def _update_level():
+    """Let through exactly the levels some handler wants, so everything else is skipped early."""
+    root = logging.getLogger(ROOT_NAME)
+    levels = [handler.level for handler in root.handlers]
+    root.setLevel(min(levels) if levels else WARNING)
+    # Don't also pass records to the application's root logger
+    root.propagate = not levels
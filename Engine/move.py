@@ -0,0 +1,72 @@
+"""
+Compact integer move encoding used by the bitboard search.
+
+Layout: bits 0-5 origin square, bits 6-11 destination square, bits 12-14
+promotion piece type (ChessPieceType value, 0 for none), bits 15-18 flags.
+"""
+
+# Move flags, already shifted into place
+CAPTURE = 1 << 15
+DOUBLE_PUSH = 1 << 16
+EN_PASSANT = 1 << 17
+CASTLE = 1 << 18
+
+NULL_MOVE = 0
+
+FILES = "abcdefgh"
+PROMOTION_LETTERS = {1: "q", 2: "r", 3: "b", 4: "n"}
+
+
+def encode_move(from_sq, to_sq, promotion=0, flags=0):
+    """
+    Pack a move into a single integer.
+
+    Args:
+        from_sq (int): The origin square index.
+        to_sq (int): The destination square index.
+        promotion (int): ChessPieceType value of the promotion piece, or 0.
+        flags (int): Any combination of CAPTURE, DOUBLE_PUSH, EN_PASSANT, CASTLE.
+
+    Returns:
+        int: The encoded move.
+    """
+    return from_sq | (to_sq << 6) | (promotion << 12) | flags
+
+
+def move_from(move):
+    """Origin square of an encoded move."""
+    return move & 63
+
+
+def move_to(move):
+    """Destination square of an encoded move."""
+    return (move >> 6) & 63
+
+
+def move_promotion(move):
+    """Promotion piece type value of an encoded move (0 if none)."""
+    return (move >> 12) & 7
+
+
+def square_name(sq):
+    """Algebraic name of a square index, e.g. 12 -> 'e2'."""
+    return FILES[sq & 7] + str((sq >> 3) + 1)
+
+
+def move_to_uci(move):
+    """
+    Format an encoded move in UCI long algebraic notation.
+
+    Args:
+        move (int): The encoded move.
+
+    Returns:
+        str: The move, e.g. 'e2e4' or 'e7e8q'.
+    """
+    if move == NULL_MOVE:
+        return "0000"
+    text = square_name(move & 63) + square_name((move >> 6) & 63)
+    promotion = (move >> 12) & 7
+    if promotion:
+        text += PROMOTION_LETTERS[promotion]
+    return text
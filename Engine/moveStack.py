@@ -1,3 +1,9 @@
+from Engine.chessPiece import ChessPieceType
+from Engine.bitboard import square
+from Engine.log import get_logger
+
+log = get_logger("moves")
+
 class moveStack:
     """Class representing the history of moves in the game."""
     def __init__(self, ChessBoard):
@@ -30,6 +36,10 @@ class moveStack:
             captured_piece (ChessPiece): The captured piece, if any.
         """
         self.stack.append((piece, start_pos, end_pos, captured_piece)) 
+        if self.ChessBoard.bitboard is not None:
+            self.ChessBoard.bitboard.push_state(square(*start_pos), square(*end_pos),
+                                                piece.ID == ChessPieceType.PAWN,
+                                                captured_piece is not None)
 
     def getLastMove(self):
         """
@@ -51,26 +61,40 @@ class moveStack:
         """
 
         if not self.canUndoMove():
-            print("No moves to undo")
+            log.warning("No moves to undo")
             return None
         
         piece, start_pos, end_pos, captured_piece = self.stack.pop()
 
-        print(f"Undoing move: {piece.ID} from {end_pos} back to {start_pos}")
+        log.debug("Undoing move: %s from %s back to %s", piece.ID, end_pos, start_pos)
 
         # Restore piece to original position
-        self.ChessBoard.board[start_pos[0], start_pos[1]] = piece
+        self.ChessBoard.setSquare(start_pos[0], start_pos[1], piece)
         piece.xGrid, piece.yGrid = start_pos
 
+        # Castling also moved the rook; put it back in its corner
+        if piece.ID == ChessPieceType.KING and abs(end_pos[0] - start_pos[0]) == 2:
+            rookFrom, rookTo = (7, 5) if end_pos[0] == 6 else (0, 3)
+            rook = self.ChessBoard.board[rookTo, end_pos[1]]
+            self.ChessBoard.setSquare(rookTo, end_pos[1], None)
+            rook.xGrid = rookFrom
+            self.ChessBoard.setSquare(rookFrom, end_pos[1], rook)
+
         # Handle captured piece restoration
         if captured_piece:
-            self.ChessBoard.board[end_pos[0], end_pos[1]] = captured_piece
+            if (captured_piece.xGrid, captured_piece.yGrid) != end_pos:
+                # En passant: the captured pawn stood beside the destination
+                self.ChessBoard.setSquare(end_pos[0], end_pos[1], None)
+            self.ChessBoard.setSquare(captured_piece.xGrid, captured_piece.yGrid, captured_piece)
             if RecordCapture and captured_piece in self.ChessBoard.captured:
                 # Remove the exact piece object from captured list
                 self.ChessBoard.captured.remove(captured_piece)
-                print(f"Restored captured piece: {captured_piece.ID}")
+                log.debug("Restored captured piece: %s", captured_piece.ID)
         else:
-            self.ChessBoard.board[end_pos[0], end_pos[1]] = None
+            self.ChessBoard.setSquare(end_pos[0], end_pos[1], None)
+
+        if self.ChessBoard.bitboard is not None:
+            self.ChessBoard.bitboard.pop_state()
 
         return (piece, start_pos, end_pos, captured_piece)
 
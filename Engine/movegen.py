@@ -0,0 +1,416 @@
+from Engine.attacks import *
+from Engine.bitboard import (WHITE, KING, QUEEN, ROOK, BISHOP, KNIGHT, PAWN,
+                             WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE,
+                             BLACK_QUEENSIDE, NO_SQUARE)
+from Engine.move import CAPTURE, DOUBLE_PUSH, EN_PASSANT, CASTLE
+
+RANK_1 = 0xFF
+RANK_8 = 0xFF << 56
+PROMOTION_RANKS = (RANK_8, RANK_1)
+DOUBLE_PUSH_RANKS = (0xFF << 8, 0xFF << 48)
+PROMOTION_PIECES = (QUEEN, ROOK, BISHOP, KNIGHT)
+# Positions each status cache remembers before dropping the oldest
+STATUS_CACHE_SIZE = 8192
+
+# (right, squares that must be empty, squares the king crosses, king from, king to)
+CASTLING_MOVES = (
+    ((WHITE_KINGSIDE, 0x60, (4, 5, 6), 4, 6), (WHITE_QUEENSIDE, 0x0E, (4, 3, 2), 4, 2)),
+    ((BLACK_KINGSIDE, 0x60 << 56, (60, 61, 62), 60, 62),
+     (BLACK_QUEENSIDE, 0x0E << 56, (60, 59, 58), 60, 58)),
+)
+
+
+def _add_targets(moves, from_sq, targets, enemy):
+    """Append one move per set bit of ``targets``, flagging captures."""
+    while targets:
+        lsb = targets & -targets
+        to_sq = lsb.bit_length() - 1
+        if lsb & enemy:
+            moves.append(from_sq | (to_sq << 6) | CAPTURE)
+        else:
+            moves.append(from_sq | (to_sq << 6))
+        targets ^= lsb
+
+
+def _add_pawn_move(moves, from_sq, to_sq, flags, us):
+    if (1 << to_sq) & PROMOTION_RANKS[us]:
+        for promotion in PROMOTION_PIECES:
+            moves.append(from_sq | (to_sq << 6) | (promotion << 12) | flags)
+    else:
+        moves.append(from_sq | (to_sq << 6) | flags)
+
+
+def generate_moves(position):
+    """
+    Generate pseudo-legal moves for the side to move.
+
+    Moves may leave the mover's own king in check; use generate_legal_moves
+    when only legal moves are wanted.
+
+    Args:
+        position (Bitboard): The position to generate moves for.
+
+    Returns:
+        list: Encoded moves (see Engine.move).
+    """
+    moves = []
+    us = position.side
+    them = us ^ 1
+    pieces = position.pieces
+    own = position.occupancy[us]
+    enemy = position.occupancy[them]
+    occupied = position.occupied
+    base = us * 6
+
+    # Pawns
+    forward = 8 if us == WHITE else -8
+    ep_square = position.ep_square
+    ep_bit = 1 << ep_square if ep_square != NO_SQUARE else 0
+    bb = pieces[base + PAWN]
+    while bb:
+        lsb = bb & -bb
+        from_sq = lsb.bit_length() - 1
+        bb ^= lsb
+        to_sq = from_sq + forward
+        if not occupied & (1 << to_sq):
+            _add_pawn_move(moves, from_sq, to_sq, 0, us)
+            if lsb & DOUBLE_PUSH_RANKS[us] and not occupied & (1 << (to_sq + forward)):
+                moves.append(from_sq | ((to_sq + forward) << 6) | DOUBLE_PUSH)
+        attacks = PAWN_ATTACKS[us][from_sq]
+        captures = attacks & enemy
+        while captures:
+            cap = captures & -captures
+            _add_pawn_move(moves, from_sq, cap.bit_length() - 1, CAPTURE, us)
+            captures ^= cap
+        if attacks & ep_bit:
+            moves.append(from_sq | (ep_square << 6) | CAPTURE | EN_PASSANT)
+
+    # Knights
+    bb = pieces[base + KNIGHT]
+    while bb:
+        lsb = bb & -bb
+        from_sq = lsb.bit_length() - 1
+        bb ^= lsb
+        _add_targets(moves, from_sq, KNIGHT_ATTACKS[from_sq] & ~own, enemy)
+
+    # Sliders
+    bb = pieces[base + BISHOP] | pieces[base + QUEEN]
+    while bb:
+        lsb = bb & -bb
+        from_sq = lsb.bit_length() - 1
+        bb ^= lsb
+        _add_targets(moves, from_sq,
+                     BISHOP_TABLES[from_sq][occupied & BISHOP_MASKS[from_sq]] & ~own, enemy)
+    bb = pieces[base + ROOK] | pieces[base + QUEEN]
+    while bb:
+        lsb = bb & -bb
+        from_sq = lsb.bit_length() - 1
+        bb ^= lsb
+        _add_targets(moves, from_sq,
+                     ROOK_TABLES[from_sq][occupied & ROOK_MASKS[from_sq]] & ~own, enemy)
+
+    # King
+    bb = pieces[base + KING]
+    if bb:
+        from_sq = bb.bit_length() - 1
+        _add_targets(moves, from_sq, KING_ATTACKS[from_sq] & ~own, enemy)
+        if position.castling:
+            for right, between, path, king_from, king_to in CASTLING_MOVES[us]:
+                if (position.castling & right and not occupied & between and
+                        not any(position.is_square_attacked(sq, them) for sq in path)):
+                    moves.append(king_from | (king_to << 6) | CASTLE)
+
+    return moves
+
+
+def generate_captures(position):
+    """
+    Generate pseudo-legal captures and queen promotions for the side to move.
+
+    These are the moves the quiescence search looks at; underpromotions are
+    left out since they almost never matter there.
+
+    Args:
+        position (Bitboard): The position to generate moves for.
+
+    Returns:
+        list: Encoded moves (see Engine.move).
+    """
+    moves = []
+    us = position.side
+    pieces = position.pieces
+    enemy = position.occupancy[us ^ 1]
+    occupied = position.occupied
+    base = us * 6
+
+    forward = 8 if us == WHITE else -8
+    ep_square = position.ep_square
+    ep_bit = 1 << ep_square if ep_square != NO_SQUARE else 0
+    promotion_rank = PROMOTION_RANKS[us]
+    bb = pieces[base + PAWN]
+    while bb:
+        lsb = bb & -bb
+        from_sq = lsb.bit_length() - 1
+        bb ^= lsb
+        to_sq = from_sq + forward
+        if (1 << to_sq) & promotion_rank and not occupied & (1 << to_sq):
+            moves.append(from_sq | (to_sq << 6) | (QUEEN << 12))
+        attacks = PAWN_ATTACKS[us][from_sq]
+        captures = attacks & enemy
+        while captures:
+            cap = captures & -captures
+            to_sq = cap.bit_length() - 1
+            if cap & promotion_rank:
+                moves.append(from_sq | (to_sq << 6) | (QUEEN << 12) | CAPTURE)
+            else:
+                moves.append(from_sq | (to_sq << 6) | CAPTURE)
+            captures ^= cap
+        if attacks & ep_bit:
+            moves.append(from_sq | (ep_square << 6) | CAPTURE | EN_PASSANT)
+
+    bb = pieces[base + KNIGHT]
+    while bb:
+        lsb = bb & -bb
+        from_sq = lsb.bit_length() - 1
+        bb ^= lsb
+        _add_targets(moves, from_sq, KNIGHT_ATTACKS[from_sq] & enemy, enemy)
+    bb = pieces[base + BISHOP] | pieces[base + QUEEN]
+    while bb:
+        lsb = bb & -bb
+        from_sq = lsb.bit_length() - 1
+        bb ^= lsb
+        _add_targets(moves, from_sq,
+                     BISHOP_TABLES[from_sq][occupied & BISHOP_MASKS[from_sq]] & enemy, enemy)
+    bb = pieces[base + ROOK] | pieces[base + QUEEN]
+    while bb:
+        lsb = bb & -bb
+        from_sq = lsb.bit_length() - 1
+        bb ^= lsb
+        _add_targets(moves, from_sq,
+                     ROOK_TABLES[from_sq][occupied & ROOK_MASKS[from_sq]] & enemy, enemy)
+    bb = pieces[base + KING]
+    if bb:
+        from_sq = bb.bit_length() - 1
+        _add_targets(moves, from_sq, KING_ATTACKS[from_sq] & enemy, enemy)
+
+    return moves
+
+
+def checkers_and_pins(position, king_sq):
+    """
+    Find the pieces giving check and the pieces pinned to the side to move's king.
+
+    Args:
+        position (Bitboard): The position.
+        king_sq (int): The square of the side to move's king.
+
+    Returns:
+        tuple: (bitboard of checking pieces, bitboard of pinned own pieces).
+    """
+    us = position.side
+    them = us ^ 1
+    pieces = position.pieces
+    base = them * 6
+    occupied = position.occupied
+    straight = pieces[base + ROOK] | pieces[base + QUEEN]
+    diagonal = pieces[base + BISHOP] | pieces[base + QUEEN]
+
+    checkers = ((PAWN_ATTACKS[us][king_sq] & pieces[base + PAWN]) |
+                (KNIGHT_ATTACKS[king_sq] & pieces[base + KNIGHT]))
+
+    # Sliders that would hit the king on an empty board check it with nothing
+    # in between, and pin the piece when exactly one of ours is in between
+    snipers = ((ROOK_TABLES[king_sq][0] & straight) | (BISHOP_TABLES[king_sq][0] & diagonal))
+    pinned = 0
+    own = position.occupancy[us]
+    while snipers:
+        lsb = snipers & -snipers
+        snipers ^= lsb
+        blockers = BETWEEN[king_sq][lsb.bit_length() - 1] & occupied
+        if not blockers:
+            checkers |= lsb
+        elif not blockers & (blockers - 1) and blockers & own:
+            pinned |= blockers
+    return checkers, pinned
+
+
+def _add_legal_pawn_moves(moves, position, from_sq, allowed, king_sq, us):
+    """Append the legal moves of one pawn; ``allowed`` masks its destination squares."""
+    them = us ^ 1
+    occupied = position.occupied
+    enemy = position.occupancy[them]
+    forward = 8 if us == WHITE else -8
+    to_sq = from_sq + forward
+    if not occupied & (1 << to_sq):
+        if allowed & (1 << to_sq):
+            _add_pawn_move(moves, from_sq, to_sq, 0, us)
+        double = to_sq + forward
+        if ((1 << from_sq) & DOUBLE_PUSH_RANKS[us] and not occupied & (1 << double) and
+                allowed & (1 << double)):
+            moves.append(from_sq | (double << 6) | DOUBLE_PUSH)
+    attacks = PAWN_ATTACKS[us][from_sq]
+    captures = attacks & enemy & allowed
+    while captures:
+        cap = captures & -captures
+        _add_pawn_move(moves, from_sq, cap.bit_length() - 1, CAPTURE, us)
+        captures ^= cap
+
+    ep_square = position.ep_square
+    if ep_square != NO_SQUARE and attacks & (1 << ep_square):
+        # The captured pawn leaves a square off the pawn's path, so check the
+        # king against the occupancy after the capture instead of using masks
+        captured_sq = ep_square - forward
+        pieces = position.pieces
+        base = them * 6
+        after = (occupied ^ (1 << from_sq) ^ (1 << captured_sq)) | (1 << ep_square)
+        if not ((PAWN_ATTACKS[us][king_sq] & pieces[base + PAWN] & ~(1 << captured_sq)) or
+                (KNIGHT_ATTACKS[king_sq] & pieces[base + KNIGHT]) or
+                (ROOK_TABLES[king_sq][after & ROOK_MASKS[king_sq]] &
+                 (pieces[base + ROOK] | pieces[base + QUEEN])) or
+                (BISHOP_TABLES[king_sq][after & BISHOP_MASKS[king_sq]] &
+                 (pieces[base + BISHOP] | pieces[base + QUEEN]))):
+            moves.append(from_sq | (ep_square << 6) | CAPTURE | EN_PASSANT)
+
+
+def generate_legal_moves(position):
+    """
+    Generate legal moves for the side to move.
+
+    Args:
+        position (Bitboard): The position to generate moves for.
+
+    Returns:
+        list: Encoded legal moves, in the same order as generate_moves.
+    """
+    return _legal_moves(position)[0]
+
+
+def position_status(position):
+    """
+    Get whether the side to move is in check together with its legal moves.
+
+    Both come out of a single pass of the legal move generator and are
+    remembered in the position's status cache under its hash, so asking
+    again about the same position (from this Bitboard or any copy of it)
+    generates nothing.
+
+    Args:
+        position (Bitboard): The position.
+
+    Returns:
+        tuple: (in check, legal moves). The list is shared with the cache;
+            copy it before reordering or changing it.
+    """
+    cache = position.status_cache
+    status = cache.get(position.hash)
+    if status is None:
+        moves, checkers = _legal_moves(position)
+        status = (checkers != 0, moves)
+        if len(cache) >= STATUS_CACHE_SIZE:
+            # Drop the oldest entry
+            del cache[next(iter(cache))]
+        cache[position.hash] = status
+    return status
+
+
+def _legal_moves(position):
+    """
+    Generate legal moves for the side to move, and find the checking pieces.
+
+    The checking and pinned pieces are found once up front. In check, the
+    other pieces may only capture the checker or block its ray, and in
+    double check only the king moves; a pinned piece stays on the line
+    through its king and the pinner; the king steps only to squares no
+    enemy piece attacks once it has left its own. So no move is ever made
+    and taken back to test it.
+
+    Args:
+        position (Bitboard): The position to generate moves for.
+
+    Returns:
+        tuple: (encoded legal moves, bitboard of the pieces giving check).
+    """
+    us = position.side
+    them = us ^ 1
+    pieces = position.pieces
+    base = us * 6
+    king = pieces[base + KING]
+    if not king:
+        # No king to protect
+        return generate_moves(position), 0
+    king_sq = king.bit_length() - 1
+
+    moves = []
+    own = position.occupancy[us]
+    enemy = position.occupancy[them]
+    occupied = position.occupied
+    checkers, pinned = checkers_and_pins(position, king_sq)
+
+    if checkers & (checkers - 1):
+        # Double check: only the king can move
+        allowed = 0
+    elif checkers:
+        allowed = checkers | BETWEEN[king_sq][checkers.bit_length() - 1]
+    else:
+        allowed = ~own
+    line = LINE[king_sq]
+
+    if allowed:
+        # Pawns
+        bb = pieces[base + PAWN]
+        while bb:
+            lsb = bb & -bb
+            from_sq = lsb.bit_length() - 1
+            bb ^= lsb
+            _add_legal_pawn_moves(moves, position, from_sq,
+                                  allowed & line[from_sq] if lsb & pinned else allowed,
+                                  king_sq, us)
+
+        # Knights: a pinned knight can never stay on its line
+        bb = pieces[base + KNIGHT] & ~pinned
+        while bb:
+            lsb = bb & -bb
+            from_sq = lsb.bit_length() - 1
+            bb ^= lsb
+            _add_targets(moves, from_sq, KNIGHT_ATTACKS[from_sq] & ~own & allowed, enemy)
+
+        # Sliders
+        bb = pieces[base + BISHOP] | pieces[base + QUEEN]
+        while bb:
+            lsb = bb & -bb
+            from_sq = lsb.bit_length() - 1
+            bb ^= lsb
+            targets = BISHOP_TABLES[from_sq][occupied & BISHOP_MASKS[from_sq]] & ~own & allowed
+            if lsb & pinned:
+                targets &= line[from_sq]
+            _add_targets(moves, from_sq, targets, enemy)
+        bb = pieces[base + ROOK] | pieces[base + QUEEN]
+        while bb:
+            lsb = bb & -bb
+            from_sq = lsb.bit_length() - 1
+            bb ^= lsb
+            targets = ROOK_TABLES[from_sq][occupied & ROOK_MASKS[from_sq]] & ~own & allowed
+            if lsb & pinned:
+                targets &= line[from_sq]
+            _add_targets(moves, from_sq, targets, enemy)
+
+    # King: test its squares with the king itself lifted off the board, so it
+    # cannot hide behind itself from a slider
+    without_king = occupied ^ king
+    targets = KING_ATTACKS[king_sq] & ~own
+    while targets:
+        lsb = targets & -targets
+        targets ^= lsb
+        to_sq = lsb.bit_length() - 1
+        if not position.is_square_attacked(to_sq, them, without_king):
+            if lsb & enemy:
+                moves.append(king_sq | (to_sq << 6) | CAPTURE)
+            else:
+                moves.append(king_sq | (to_sq << 6))
+    if position.castling and not checkers:
+        for right, between, path, king_from, king_to in CASTLING_MOVES[us]:
+            if (position.castling & right and not occupied & between and
+                    not any(position.is_square_attacked(sq, them) for sq in path[1:])):
+                moves.append(king_from | (king_to << 6) | CASTLE)
+
+    return moves, checkers
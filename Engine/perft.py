@@ -0,0 +1,151 @@
+"""
+Perft: count the leaf nodes of the legal move tree to a fixed depth.
+
+The counts of the reference positions are known exactly, so any move
+generator bug shows up as a mismatch, and the nodes per second make a
+repeatable speed benchmark for the move generator.
+
+Run ``python -m Engine.perft`` for the reference suite, or
+``python -m Engine.perft --fen "<fen>" --depth 4 --divide`` to split one
+position's count by root move when hunting a bug.
+"""
+import argparse
+import time
+from Engine.movegen import generate_legal_moves
+from Engine.move import move_to_uci
+from Engine.fen import parse_fen, START_FEN
+
+# (name, FEN, node counts for depth 1, 2, ...)
+REFERENCE_POSITIONS = (
+    ("startpos", START_FEN, (20, 400, 8902, 197281, 4865609, 119060324)),
+    ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+     (48, 2039, 97862, 4085603, 193690690)),
+    ("position3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+     (14, 191, 2812, 43238, 674624, 11030083)),
+    ("position4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+     (6, 264, 9467, 422333, 15833292)),
+    ("position5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+     (44, 1486, 62379, 2103487, 89941194)),
+    ("position6", "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+     (46, 2079, 89890, 3894594, 164075551)),
+)
+
+DEFAULT_SUITE_DEPTH = 3
+
+
+def perft(position, depth):
+    """
+    Count the legal move sequences of a given length.
+
+    Args:
+        position (Bitboard): The position to count from; restored on return.
+        depth (int): The number of plies.
+
+    Returns:
+        int: The number of leaf nodes.
+    """
+    if depth == 0:
+        return 1
+    moves = generate_legal_moves(position)
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        position.make_move(move)
+        nodes += perft(position, depth - 1)
+        position.unmake_move(move)
+    return nodes
+
+
+def divide(position, depth):
+    """
+    Split a perft count by root move.
+
+    Args:
+        position (Bitboard): The position to count from; restored on return.
+        depth (int): The number of plies, at least 1.
+
+    Returns:
+        dict: The UCI string of each legal root move mapped to its node count.
+    """
+    counts = {}
+    for move in generate_legal_moves(position):
+        position.make_move(move)
+        counts[move_to_uci(move)] = perft(position, depth - 1)
+        position.unmake_move(move)
+    return counts
+
+
+def timed_perft(position, depth):
+    """
+    Run perft and time it.
+
+    Returns:
+        tuple: (nodes, seconds, nodes per second).
+    """
+    start = time.perf_counter()
+    nodes = perft(position, depth)
+    seconds = time.perf_counter() - start
+    return nodes, seconds, int(nodes / seconds) if seconds > 0 else 0
+
+
+def run_suite(max_depth=DEFAULT_SUITE_DEPTH, positions=REFERENCE_POSITIONS):
+    """
+    Run perft on the reference positions and check every count.
+
+    Args:
+        max_depth (int): The deepest depth to run for each position.
+        positions (tuple): (name, FEN, expected counts) entries.
+
+    Returns:
+        bool: True if every count matched.
+    """
+    passed = True
+    total_nodes = 0
+    total_seconds = 0.0
+    for name, fen, expected in positions:
+        position = parse_fen(fen)
+        for depth in range(1, min(max_depth, len(expected)) + 1):
+            nodes, seconds, nps = timed_perft(position, depth)
+            ok = nodes == expected[depth - 1]
+            passed = passed and ok
+            total_nodes += nodes
+            total_seconds += seconds
+            print(f"{name:<10} depth {depth}  nodes {nodes:>10}  time {seconds:8.3f}s  "
+                  f"nps {nps:>8}  {'OK' if ok else f'FAIL (expected {expected[depth - 1]})'}")
+    nps = int(total_nodes / total_seconds) if total_seconds > 0 else 0
+    print(f"total      nodes {total_nodes}  time {total_seconds:.3f}s  nps {nps}  "
+          f"{'all counts match' if passed else 'MISMATCH'}")
+    return passed
+
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Perft move generator test and benchmark")
+    parser.add_argument("--depth", type=int, default=DEFAULT_SUITE_DEPTH,
+                        help="depth to count to (per position for the suite)")
+    parser.add_argument("--fen", help="count this position instead of the reference suite")
+    parser.add_argument("--divide", action="store_true", help="split the count by root move")
+    args = parser.parse_args()
+
+    if args.fen is None:
+        raise SystemExit(0 if run_suite(args.depth) else 1)
+
+    position = parse_fen(args.fen)
+    if args.divide:
+        start = time.perf_counter()
+        counts = divide(position, args.depth)
+        seconds = time.perf_counter() - start
+        for move, nodes in sorted(counts.items()):
+            print(f"{move}: {nodes}")
+        nodes = sum(counts.values())
+        print(f"\nmoves {len(counts)}  nodes {nodes}  time {seconds:.3f}s  "
+              f"nps {int(nodes / seconds) if seconds > 0 else 0}")
+    else:
+        for depth in range(1, args.depth + 1):
+            nodes, seconds, nps = timed_perft(position, depth)
+            print(f"depth {depth}  nodes {nodes:>10}  time {seconds:8.3f}s  nps {nps:>8}")
+
+
+if __name__ == "__main__":
+    main()
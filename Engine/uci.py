@@ -0,0 +1,264 @@
+"""
+UCI (Universal Chess Interface) front-end.
+
+Run with ``python -m Engine.uci`` and talk to it over stdin/stdout from a
+chess GUI or tournament manager. Searches run on a background thread, so
+the command loop keeps reading and ``stop`` takes effect right away.
+"""
+import sys
+import threading
+from Engine.engine import ChessEngine
+from Engine.bitboard import WHITE
+from Engine.move import move_to_uci
+from Engine.AI.minmax import MATE_SCORE, MATE_BOUND
+from Engine.AI.transposition import DEFAULT_SIZE_MB
+from Engine.book import open_book
+
+ENGINE_NAME = "ChessBot"
+ENGINE_AUTHOR = "GuchaIll"
+
+# Depth cap when only time (or nothing) limits the search
+UCI_MAX_DEPTH = 64
+# Moves the remaining clock time is spread over when the GUI gives no movestogo
+DEFAULT_MOVES_TO_GO = 30
+# Milliseconds kept in reserve for communication delays
+MOVE_OVERHEAD = 50
+
+
+def format_score(score, side):
+    """
+    Format a white-positive score as a UCI score from the side to move.
+
+    Args:
+        score (int): The score in centipawns, or a mate score.
+        side (int): The side to move, WHITE or BLACK.
+
+    Returns:
+        str: "cp <centipawns>" or "mate <moves>".
+    """
+    if side != WHITE:
+        score = -score
+    if abs(score) > MATE_BOUND:
+        plies = MATE_SCORE - abs(score)
+        moves = (plies + 1) // 2
+        return f"mate {moves if score > 0 else -moves}"
+    return f"cp {int(score)}"
+
+
+class UCIProtocol:
+    """Reads UCI commands and drives a ChessEngine."""
+    def __init__(self, output=None):
+        """
+        Initialize the protocol handler.
+
+        Args:
+            output (file): Where protocol messages are written; defaults to stdout.
+        """
+        self.output = output if output is not None else sys.stdout
+        self.output_lock = threading.Lock()
+        self.hash_mb = DEFAULT_SIZE_MB
+        self.book_path = None
+        self.engine = ChessEngine(UCI_MAX_DEPTH, self.hash_mb)
+        self.engine.searcher.on_iteration = self.report_iteration
+        self.search_thread = None
+        # Set by "stop" (and anything else that ends a search); "go infinite" waits for it
+        self.stop_requested = threading.Event()
+
+    def send(self, line):
+        """Write one protocol line."""
+        with self.output_lock:
+            self.output.write(line + "\n")
+            self.output.flush()
+
+    def loop(self, lines=None):
+        """
+        Process commands until "quit" or end of input.
+
+        Args:
+            lines (iterable): Command lines; defaults to stdin.
+        """
+        for line in (lines if lines is not None else sys.stdin):
+            if not self.handle(line):
+                break
+        self.stop_search()
+        self.engine.close()
+
+    def handle(self, line):
+        """
+        Process one command line.
+
+        Args:
+            line (str): The command.
+
+        Returns:
+            bool: False once the engine should quit.
+        """
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, args = tokens[0], tokens[1:]
+
+        if command == "uci":
+            self.send(f"id name {ENGINE_NAME}")
+            self.send(f"id author {ENGINE_AUTHOR}")
+            self.send(f"option name Hash type spin default {DEFAULT_SIZE_MB} min 1 max 4096")
+            self.send("option name Ponder type check default false")
+            self.send("option name BookFile type string default <empty>")
+            self.send("uciok")
+        elif command == "isready":
+            self.send("readyok")
+        elif command == "setoption":
+            self.set_option(args)
+        elif command == "ucinewgame":
+            self.stop_search()
+            self.engine.searcher.tt.clear()
+            self.engine.reset()
+        elif command == "position":
+            self.stop_search()
+            self.set_position(args)
+        elif command == "go":
+            self.stop_search()
+            self.go(args)
+        elif command == "ponderhit":
+            self.engine.searcher.ponder_hit()
+        elif command == "stop":
+            self.stop_search()
+        elif command == "quit":
+            return False
+        else:
+            self.send(f"info string Unknown command: {command}")
+        return True
+
+    def set_option(self, args):
+        """Handle "setoption name <name> value <value>"."""
+        if "name" not in args or "value" not in args:
+            return
+        name = " ".join(args[args.index("name") + 1:args.index("value")]).lower()
+        value = " ".join(args[args.index("value") + 1:])
+        if name == "hash":
+            self.stop_search()
+            self.hash_mb = max(1, int(value))
+            # A new table needs a new engine; carry the current position over to it
+            old = self.engine
+            old.close()
+            self.engine = ChessEngine(UCI_MAX_DEPTH, self.hash_mb, book_path=self.book_path)
+            self.engine.searcher.on_iteration = self.report_iteration
+            self.engine.reset(old.position)
+            self.engine.moves = old.moves
+        elif name == "bookfile":
+            self.stop_search()
+            if self.engine.searcher.book is not None:
+                self.engine.searcher.book.close()
+            self.book_path = value if value and value != "<empty>" else None
+            self.engine.searcher.book = open_book(self.book_path)
+            if self.book_path and self.engine.searcher.book is None:
+                self.send(f"info string Book not found: {self.book_path}")
+        elif name == "ponder":
+            # The GUI decides when to ponder with "go ponder"; nothing to configure
+            pass
+        else:
+            self.send(f"info string Unsupported option: {name}")
+
+    def set_position(self, args):
+        """Handle "position startpos|fen <fen> [moves ...]"."""
+        moves_at = args.index("moves") if "moves" in args else len(args)
+        if args and args[0] == "startpos":
+            self.engine.reset()
+        elif args and args[0] == "fen":
+            try:
+                self.engine.set_fen(" ".join(args[1:moves_at]))
+            except ValueError as error:
+                self.send(f"info string {error}")
+                return
+        else:
+            self.send("info string Expected 'position startpos' or 'position fen'")
+            return
+        for text in args[moves_at + 1:]:
+            try:
+                self.engine.make_move(text)
+            except ValueError as error:
+                self.send(f"info string {error}")
+                break
+
+    def go(self, args):
+        """
+        Handle "go" with wtime/btime/winc/binc/movestogo/movetime/depth/nodes/infinite/ponder.
+
+        With "ponder" the position includes the expected reply and the limits
+        only start counting at "ponderhit". With "infinite" every other limit
+        is ignored and bestmove is only sent after "stop".
+        """
+        params = {}
+        for i, token in enumerate(args):
+            if token in ("wtime", "btime", "winc", "binc", "movestogo", "movetime",
+                         "depth", "nodes") and i + 1 < len(args):
+                params[token] = int(args[i + 1])
+
+        time_limit = None
+        if "movetime" in params:
+            time_limit = max(params["movetime"] - MOVE_OVERHEAD, 1) / 1000
+        else:
+            white = self.engine.position.side == WHITE
+            time_left = params.get("wtime" if white else "btime")
+            if time_left is not None:
+                increment = params.get("winc" if white else "binc", 0)
+                moves_to_go = params.get("movestogo", DEFAULT_MOVES_TO_GO)
+                budget = time_left / moves_to_go + increment / 2
+                budget = min(budget, time_left / 2) - MOVE_OVERHEAD
+                time_limit = max(budget, 1) / 1000
+
+        infinite = "infinite" in args
+        if infinite:
+            params = {}
+            time_limit = None
+
+        self.engine.searcher.pondering = "ponder" in args
+        self.stop_requested.clear()
+        self.search_thread = threading.Thread(
+            target=self.search,
+            args=(params.get("depth"), time_limit, params.get("nodes"), infinite),
+            daemon=True)
+        self.search_thread.start()
+
+    def search(self, depth, time_limit, node_limit, infinite=False):
+        """Run one search and report the best move (runs on the search thread)."""
+        move = self.engine.search(depth, time_limit, node_limit)
+        if infinite:
+            # The search can end on its own (a mate, the depth cap); bestmove still waits for "stop"
+            self.stop_requested.wait()
+        if move is None:
+            self.engine.searcher.pondering = False
+            self.send("bestmove 0000")
+            return
+        # Suggest the principal variation's reply for the GUI to ponder on
+        pv = self.engine.searcher.pv
+        ponder = f" ponder {move_to_uci(pv[1])}" if len(pv) > 1 and pv[0] == move else ""
+        self.send(f"bestmove {move_to_uci(move)}{ponder}")
+
+    def stop_search(self):
+        """Stop a running search and wait for its bestmove."""
+        self.stop_requested.set()
+        thread = self.search_thread
+        while thread is not None and thread.is_alive():
+            # Repeat in case the search had not started (and reset its flag) yet
+            self.engine.searcher.stop()
+            thread.join(0.01)
+        self.search_thread = None
+
+    def report_iteration(self, depth, move, score, nodes, seconds, pv):
+        """Send an info line for a completed iteration (runs on the search thread)."""
+        nps = int(nodes / seconds) if seconds > 0 else 0
+        score_text = format_score(score, self.engine.position.side)
+        hashfull = self.engine.searcher.tt.hashfull()
+        self.send(f"info depth {depth} score {score_text} nodes {nodes} nps {nps} "
+                  f"time {int(seconds * 1000)} hashfull {hashfull} "
+                  f"pv {' '.join(move_to_uci(m) for m in pv or [move])}")
+
+
+def main():
+    """Run the UCI loop on stdin/stdout."""
+    UCIProtocol().loop()
+
+
+if __name__ == "__main__":
+    main()
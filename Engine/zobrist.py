@@ -0,0 +1,41 @@
+"""
+Zobrist keys for hashing bitboard positions.
+
+A position's hash is the XOR of one key per (piece, square), the side key
+when black is to move, the key of the current castling-rights mask and the
+key of the en passant file, if any. Keys come from a fixed seed so hashes
+are stable between runs and processes.
+"""
+import random
+
+_rng = random.Random(0x5EED)
+
+# PIECE_KEYS[piece index][square]
+PIECE_KEYS = [[_rng.getrandbits(64) for _ in range(64)] for _ in range(12)]
+SIDE_KEY = _rng.getrandbits(64)
+# One key per castling-rights mask (0-15) so a rights change is a single XOR
+CASTLING_KEYS = [_rng.getrandbits(64) for _ in range(16)]
+CASTLING_KEYS[0] = 0
+EP_KEYS = [_rng.getrandbits(64) for _ in range(8)]
+
+
+def compute_hash(position):
+    """
+    Compute a position's Zobrist key from scratch.
+
+    Args:
+        position (Bitboard): The position to hash.
+
+    Returns:
+        int: The 64-bit key.
+    """
+    key = 0
+    for sq, index in enumerate(position.mailbox):
+        if index < 12:
+            key ^= PIECE_KEYS[index][sq]
+    if position.side:
+        key ^= SIDE_KEY
+    key ^= CASTLING_KEYS[position.castling]
+    if position.ep_square >= 0:
+        key ^= EP_KEYS[position.ep_square & 7]
+    return key
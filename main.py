@@ -1,8 +1,12 @@
 import pygame
-from Engine.chess import *
+from ui import *
+from Engine.log import configure, INFO
 from Engine.AI.defaultAI import *
 
 
+# Show search progress on the console
+configure(INFO)
+
 # pygame setup
 pygame.init()
 screen = pygame.display.set_mode((1280, 720))
@@ -11,7 +15,7 @@ font = pygame.font.SysFont("Arial", 30)
 running = True
 dt = 0
 
-newGame = Game( screen, clock, font)
+newGame = GameUI(screen, clock, font)
 newGame.StartGame()
 newGame.PlayGame()
 
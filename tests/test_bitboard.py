@@ -0,0 +1,89 @@
+"""Position snapshots and board copies."""
+import pytest
+from Engine.bitboard import Bitboard, SNAPSHOT, NO_SQUARE, start_position
+from Engine.chessboard import Chessboard
+from Engine.fen import parse_fen, to_fen
+from Engine.movegen import generate_legal_moves
+
+SNAPSHOT_FENS = (
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    # En passant square set, black to move and ahead, so the score is negative
+    "rnbqkbnr/ppp1pppp/8/8/3pP3/8/PPPP1PPP/RNB1KBNR b KQkq e3 0 3",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "8/5pk1/6p1/8/3R4/6P1/r4PK1/8 w - - 57 140",
+)
+
+
+def assert_same_position(copy, original):
+    assert copy.hash == original.hash
+    assert copy.score == original.score
+    assert copy.mailbox == original.mailbox
+    assert copy.pieces == original.pieces
+    assert copy.occupancy == original.occupancy
+    assert copy.occupied == original.occupied
+    assert to_fen(copy) == to_fen(original)
+
+
+@pytest.mark.parametrize("fen", SNAPSHOT_FENS)
+def test_snapshot_round_trip(fen):
+    position = parse_fen(fen)
+    snapshot = position.snapshot()
+    assert len(snapshot) == SNAPSHOT.size
+    assert_same_position(Bitboard.from_snapshot(snapshot), position)
+
+
+def test_snapshot_keeps_en_passant_and_negative_score():
+    position = parse_fen(SNAPSHOT_FENS[1])
+    assert position.ep_square != NO_SQUARE and position.score < 0
+    restored = Bitboard.from_snapshot(position.snapshot())
+    assert restored.ep_square == position.ep_square
+    assert restored.score == position.score
+    assert sorted(generate_legal_moves(restored)) == sorted(generate_legal_moves(position))
+
+
+def test_restore_overwrites_in_place_and_drops_history():
+    position = parse_fen(SNAPSHOT_FENS[2])
+    snapshot = position.snapshot()
+    reused = start_position()
+    reused.make_move(generate_legal_moves(reused)[0])
+    reused.restore(snapshot)
+    assert_same_position(reused, position)
+    assert reused.history == [] and reused.hash_history == [] and reused.score_history == []
+
+
+def test_restored_hash_matches_a_fresh_hash():
+    position = parse_fen(SNAPSHOT_FENS[1])
+    restored = Bitboard.from_snapshot(position.snapshot())
+    restored.rehash()
+    assert restored.hash == position.hash and restored.score == position.score
+
+
+@pytest.mark.parametrize("backend", ("bitboard", "object"))
+def test_chessboard_copy(backend):
+    board = Chessboard(backend)
+    board.SetUpBoard()
+    board.board[4, 1].move((4, 3))
+    copy = board.copy()
+    # The copy's move stack starts empty, so only the placement is compared for the object backend
+    assert copy.to_fen().split()[0] == board.to_fen().split()[0]
+    if backend == "bitboard":
+        assert_same_position(copy.bitboard, board.bitboard)
+    assert copy.kings["white"] is copy.board[4, 0]
+    assert all(piece.ChessBoard is copy for piece in copy.pieces("black"))
+    # Moving on the copy leaves the original alone
+    copy.board[3, 6].move((3, 4))
+    assert copy.to_fen().split()[0] != board.to_fen().split()[0]
+    assert board.board[3, 6] is not None
+
+
+def test_chessboard_copy_keeps_en_passant():
+    board = Chessboard("bitboard")
+    board.SetUpBoard()
+    for start, end in (((4, 1), (4, 3)), ((0, 6), (0, 5)), ((4, 3), (4, 4)), ((5, 6), (5, 4))):
+        assert board.board[start].move(end)
+    copy = board.copy()
+    assert copy.bitboard.ep_square == board.bitboard.ep_square == 45
+    assert copy.board[4, 4].move((5, 5))
+    assert copy.board[5, 4] is None
+    assert copy.to_fen() == "rnbqkbnr/1pppp1pp/p4P2/8/8/8/PPPP1PPP/RNBQKBNR b KQkq - 0 3"
+    assert board.board[5, 4] is not None
@@ -0,0 +1,94 @@
+"""Polyglot keys and opening book files."""
+import pytest
+from Engine.book import OpeningBook, encode_book_move, open_book, write_book
+from Engine.engine import ChessEngine
+from Engine.polyglot import polyglot_key
+
+# Reference keys from the Polyglot book format specification
+KEY_VECTORS = (
+    ((), 0x463b96181691fc9c),
+    (("e2e4",), 0x823c9b50fd114196),
+    (("e2e4", "d7d5"), 0x0756b94461c50fb0),
+    (("e2e4", "d7d5", "e4e5"), 0x662fafb965db29d4),
+    (("e2e4", "d7d5", "e4e5", "f7f5"), 0x22a48b5a8e47ff78),
+    (("e2e4", "d7d5", "e4e5", "f7f5", "e1e2"), 0x652a607ca3f242c1),
+    (("e2e4", "d7d5", "e4e5", "f7f5", "e1e2", "e8f7"), 0x00fdd303c946bdd9),
+    (("a2a4", "b7b5", "h2h4", "b5b4", "c2c4"), 0x3c8123ea7b067637),
+    (("a2a4", "b7b5", "h2h4", "b5b4", "c2c4", "b4c3", "a1a3"), 0x5c3f9b829b279560),
+)
+
+
+def play(*moves, fen=None):
+    engine = ChessEngine(depth=1, hash_mb=1)
+    if fen is not None:
+        engine.set_fen(fen)
+    for move in moves:
+        engine.make_move(move)
+    return engine
+
+
+@pytest.mark.parametrize("moves, key", KEY_VECTORS)
+def test_polyglot_key_vectors(moves, key):
+    assert polyglot_key(play(*moves).position) == key
+
+
+def test_encode_book_move():
+    engine = play()
+    # Destination in bits 0-5, origin in bits 6-11
+    assert encode_book_move(engine.parse_move("e2e4")) == 12 << 6 | 28
+    # Castling is written as the king taking its rook
+    engine = play(fen="r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+    assert encode_book_move(engine.parse_move("e1g1")) == 4 << 6 | 7
+    assert encode_book_move(engine.parse_move("e1c1")) == 4 << 6 | 0
+    # Promotion piece in bits 12-14
+    engine = play(fen="4k3/P7/8/8/8/8/8/4K3 w - - 0 1")
+    assert encode_book_move(engine.parse_move("a7a8q")) == 4 << 12 | 48 << 6 | 56
+    assert encode_book_move(engine.parse_move("a7a8n")) == 1 << 12 | 48 << 6 | 56
+
+
+def test_write_and_read_book(tmp_path):
+    start = play()
+    castling = play(fen="r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+    after_e4 = play("e2e4")
+    e4, d4, a3 = (start.parse_move(move) for move in ("e2e4", "d2d4", "a2a3"))
+    kingside = castling.parse_move("e1g1")
+    c5 = after_e4.parse_move("c7c5")
+    path = str(tmp_path / "book.bin")
+    write_book(path, [
+        (polyglot_key(castling.position), kingside, 3),
+        (polyglot_key(start.position), d4, 5),
+        (polyglot_key(after_e4.position), c5, 7),
+        (polyglot_key(start.position), e4, 10),
+        (polyglot_key(start.position), a3, 0),
+    ])
+
+    book = open_book(path)
+    assert isinstance(book, OpeningBook)
+    with book:
+        assert len(book) == 5
+        assert book.entries(polyglot_key(start.position)) == [
+            (encode_book_move(d4), 5), (encode_book_move(e4), 10), (encode_book_move(a3), 0)]
+        assert book.entries(0) == []
+        assert sorted(book.moves(start.position)) == sorted([(d4, 5), (e4, 10), (a3, 0)])
+        assert book.choose(start.position, randomize=False) == e4
+        # A zero weight is never picked
+        assert all(book.choose(start.position) in (d4, e4) for _ in range(50))
+        assert book.moves(castling.position) == [(kingside, 3)]
+        assert book.choose(after_e4.position, randomize=False) == c5
+        assert book.choose(play("d2d4").position) is None
+
+
+def test_engine_plays_from_book(tmp_path):
+    start = play()
+    path = str(tmp_path / "book.bin")
+    write_book(path, [(polyglot_key(start.position), start.parse_move("g1f3"), 1)])
+    engine = ChessEngine(depth=1, hash_mb=1, book_path=path)
+    try:
+        assert engine.search() == engine.parse_move("g1f3")
+    finally:
+        engine.close()
+
+
+def test_open_missing_book(tmp_path):
+    assert open_book(str(tmp_path / "missing.bin")) is None
+    assert open_book(None) is None
@@ -0,0 +1,34 @@
+"""Vectorized evaluation against the per-position score."""
+import numpy as np
+import pytest
+from Engine.bitboard import EMPTY
+from Engine.evaluation import Evaluator
+from Engine.fen import parse_fen
+from Engine.perft import REFERENCE_POSITIONS
+
+FENS = [fen for _, fen, _ in REFERENCE_POSITIONS] + [
+    "rnbqkbnr/ppp1pppp/8/8/3pP3/8/PPPP1PPP/RNB1KBNR b KQkq e3 0 3",
+    "8/5pk1/6p1/8/3R4/6P1/r4PK1/8 w - - 0 40",
+]
+
+
+def test_batch_of_mailboxes_matches_each_position():
+    evaluator = Evaluator()
+    positions = [parse_fen(fen) for fen in FENS]
+    scores = evaluator.evaluate_batch(np.array([bb.mailbox for bb in positions], dtype=np.int8))
+    assert scores.shape == (len(positions),)
+    for score, position in zip(scores, positions):
+        assert score == pytest.approx(evaluator.evaluate_bitboard(position))
+
+
+def test_batch_of_piece_planes_matches_each_position():
+    evaluator = Evaluator()
+    positions = [parse_fen(fen) for fen in FENS]
+    planes = np.zeros((len(positions), 12, 64), dtype=np.int8)
+    for n, position in enumerate(positions):
+        for sq, index in enumerate(position.mailbox):
+            if index != EMPTY:
+                planes[n, index, sq] = 1
+    scores = evaluator.evaluate_batch(planes)
+    for score, position in zip(scores, positions):
+        assert score == pytest.approx(evaluator.evaluate_bitboard(position))
@@ -0,0 +1,77 @@
+"""FEN import and export."""
+import pytest
+from Engine.bitboard import start_position
+from Engine.chessboard import Chessboard
+from Engine.fen import START_FEN, parse_fen, to_fen
+
+ROUND_TRIP_FENS = (
+    START_FEN,
+    # En passant square
+    "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3",
+    "rnbqkbnr/pppp1ppp/8/8/3Pp3/8/PPP1PPPP/RNBQKBNR b KQkq d3 0 2",
+    # Partial castling rights
+    "r3k2r/8/8/8/8/8/8/R3K2R w Kq - 0 1",
+    "r3k2r/8/8/8/8/8/8/R3K2R b Qk - 4 20",
+    "4k3/8/8/8/8/8/8/4K3 w - - 0 1",
+    # High move clocks
+    "8/5pk1/6p1/8/3R4/6P1/r4PK1/8 b - - 99 187",
+    "8/8/8/8/8/8/8/K6k w - - 1234 5678",
+)
+
+MALFORMED_FENS = (
+    # Rank too long, too short, wrong length of pieces
+    "rnbqkbnr/pppppppp/9/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "rnbqkbnr/pppppppp/7/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "rnbqkbnr/ppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    # Seven ranks
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP w KQkq - 0 1",
+    # Bad side to move
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR x KQkq - 0 1",
+    # Bad piece letter
+    "rnbqkbnr/ppppxppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    # Bad castling rights and en passant square
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQxq - 0 1",
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq z9 0 1",
+    # Too few fields
+    "8/8/8/8/8/8/8/8 w",
+)
+
+
+@pytest.mark.parametrize("fen", ROUND_TRIP_FENS)
+def test_round_trip(fen):
+    assert to_fen(parse_fen(fen)) == fen
+
+
+def test_start_position_matches_start_fen():
+    position = parse_fen(START_FEN)
+    start = start_position()
+    assert position.hash == start.hash
+    assert position.mailbox == start.mailbox
+    assert to_fen(start) == START_FEN
+
+
+def test_parsed_fields():
+    position = parse_fen(ROUND_TRIP_FENS[2])
+    assert position.side == 1
+    assert position.ep_square == 19
+    assert (position.halfmove, position.fullmove) == (0, 2)
+
+
+@pytest.mark.parametrize("fen", MALFORMED_FENS)
+def test_malformed_fen_raises_value_error(fen):
+    with pytest.raises(ValueError):
+        parse_fen(fen)
+
+
+@pytest.mark.parametrize("fen, pawn, target, victim", (
+    (ROUND_TRIP_FENS[1], (4, 4), (5, 5), (5, 4)),
+    (ROUND_TRIP_FENS[2], (4, 3), (3, 2), (3, 3)),
+))
+def test_en_passant_from_fen_on_piece_board(fen, pawn, target, victim):
+    board = Chessboard.from_fen(fen)
+    captured = board.board[victim]
+    assert target in board.board[pawn].validMove()
+    assert board.board[pawn].move(target)
+    assert board.board[victim] is None
+    assert board.captured == [captured]
+    assert board.bitboard.ep_square == -1
@@ -0,0 +1,40 @@
+"""Incrementally updated hash and score against a from-scratch recompute."""
+from Engine.evaluation import score_position
+from Engine.fen import parse_fen, to_fen
+from Engine.move import move_to_uci, CAPTURE, CASTLE, EN_PASSANT
+from Engine.movegen import generate_legal_moves
+from Engine.zobrist import compute_hash
+
+START = "r3k2r/1P6/8/3pP3/8/8/8/R3K2R w KQkq d6 0 1"
+# En passant, castling, a capturing promotion, a rook capture and castling queenside
+LINE = ("e5d6", "e8g8", "b7a8q", "f8a8", "e1c1")
+
+
+def assert_recomputed(position):
+    assert position.hash == compute_hash(position)
+    assert position.score == score_position(position.pieces)
+
+
+def find_move(position, uci):
+    return next(move for move in generate_legal_moves(position) if move_to_uci(move) == uci)
+
+
+def test_make_unmake_keeps_hash_and_score():
+    position = parse_fen(START)
+    start_hash, start_score = position.hash, position.score
+    played = []
+    for uci in LINE:
+        move = find_move(position, uci)
+        position.make_move(move)
+        played.append(move)
+        assert_recomputed(position)
+
+    flags = [move & (CAPTURE | CASTLE | EN_PASSANT) for move in played]
+    assert flags[0] & EN_PASSANT and flags[1] & CASTLE and flags[3] & CAPTURE
+    assert (played[2] >> 12) & 7 and played[2] & CAPTURE
+
+    for move in reversed(played):
+        position.unmake_move(move)
+        assert_recomputed(position)
+    assert (position.hash, position.score) == (start_hash, start_score)
+    assert to_fen(position) == START
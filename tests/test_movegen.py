@@ -0,0 +1,51 @@
+"""Legal move generation, checked by perft against the reference counts."""
+import pytest
+from Engine.fen import parse_fen
+from Engine.move import move_to_uci
+from Engine.movegen import generate_legal_moves
+from Engine.perft import REFERENCE_POSITIONS, perft
+
+# Counts up to this many nodes are checked one depth deeper than the rest
+MAX_SLOW_NODES = 1000000
+
+
+def reference_cases():
+    """(FEN, depth, expected count) of every reference depth worth running."""
+    cases = []
+    for name, fen, expected in REFERENCE_POSITIONS:
+        for depth in range(1, 5):
+            if depth == 4 and expected[3] > MAX_SLOW_NODES:
+                continue
+            cases.append(pytest.param(fen, depth, expected[depth - 1], id=f"{name}-{depth}"))
+    return cases
+
+
+@pytest.mark.parametrize("fen, depth, expected", reference_cases())
+def test_perft_reference_positions(fen, depth, expected):
+    assert perft(parse_fen(fen), depth) == expected
+
+
+def legal_uci(fen):
+    return sorted(move_to_uci(move) for move in generate_legal_moves(parse_fen(fen)))
+
+
+def test_en_passant_pinned_along_the_rank():
+    # Taking c6 would clear the fifth rank between the rook and the king
+    moves = legal_uci("8/8/8/KPp4r/8/8/8/7k w - c6 0 2")
+    assert "b5c6" not in moves
+    assert len(moves) == 4
+
+
+def test_castling_through_an_attacked_square():
+    assert "e1g1" not in legal_uci("4kr2/8/8/8/8/8/8/4K2R w K - 0 1")
+
+
+def test_castling_out_of_check():
+    moves = legal_uci("4k3/8/8/8/8/8/4r3/R3K2R w KQ - 0 1")
+    assert "e1g1" not in moves and "e1c1" not in moves
+    assert len(moves) == 3
+
+
+def test_queenside_castling_with_only_b1_attacked():
+    # The king never crosses b1, so an attack on it does not matter
+    assert "e1c1" in legal_uci("1r2k3/8/8/8/8/8/8/R3K3 w Q - 0 1")
@@ -0,0 +1,36 @@
+"""Root-parallel search across worker processes."""
+import threading
+import time
+from Engine.AI.minmax import MinMax
+from Engine.bitboard import start_position
+from Engine.movegen import generate_legal_moves
+
+
+def test_stop_reaches_the_workers():
+    search = MinMax(None, None, 64, 1, randomize=False, workers=2)
+    position = start_position()
+    legal_moves = generate_legal_moves(position)
+    found = []
+    thread = None
+    try:
+        # Warm the pool up so process start-up is not timed
+        search.search(position, legal_moves, node_limit=200)
+
+        # No time or node limit: only stop() can end this search
+        thread = threading.Thread(target=lambda: found.append(search.search(position, legal_moves)),
+                                  daemon=True)
+        thread.start()
+        time.sleep(0.5)
+        start = time.perf_counter()
+        while thread.is_alive() and time.perf_counter() - start < 10:
+            search.stop()
+            thread.join(0.05)
+        elapsed = time.perf_counter() - start
+    finally:
+        # Shutting the pool down would wait for workers that never stopped
+        if thread is None or not thread.is_alive():
+            search.close()
+
+    assert not thread.is_alive()
+    assert elapsed < 2
+    assert found and found[0] in legal_moves
@@ -0,0 +1,39 @@
+"""Static exchange evaluation on fixed exchanges."""
+from Engine.AI.see import static_exchange, capture_gain, SEE_VALUES
+from Engine.bitboard import PAWN, ROOK, KNIGHT, QUEEN
+from Engine.fen import parse_fen
+from Engine.move import move_to_uci
+from Engine.movegen import generate_legal_moves
+
+
+def see(fen, uci):
+    position = parse_fen(fen)
+    move = next(move for move in generate_legal_moves(position) if move_to_uci(move) == uci)
+    return static_exchange(position, move), capture_gain(position, move)
+
+
+def test_queen_takes_defended_pawn():
+    # Qxd5 exd5 loses the queen for a pawn
+    score, gain = see("4k3/8/4p3/3p4/8/8/8/3QK3 w - - 0 1", "d1d5")
+    assert score == SEE_VALUES[PAWN] - SEE_VALUES[QUEEN]
+    assert gain == SEE_VALUES[PAWN]
+
+
+def test_undefended_piece():
+    score, _ = see("n3k3/8/8/8/8/8/8/R3K3 w - - 0 1", "a1a8")
+    assert score == SEE_VALUES[KNIGHT]
+
+
+def test_xray_recapture_through_a_battery():
+    # Rxd5 Rxd5 Rxd5: the rook behind the first one wins the exchange back
+    score, _ = see("3rk3/8/8/3p4/8/8/3R4/3RK3 w - - 0 1", "d2d5")
+    assert score == SEE_VALUES[PAWN]
+    # Without the second rook the capture just loses the rook for a pawn
+    score, _ = see("3rk3/8/8/3p4/8/8/3R4/4K3 w - - 0 1", "d2d5")
+    assert score == SEE_VALUES[PAWN] - SEE_VALUES[ROOK]
+
+
+def test_black_side_and_equal_trade():
+    # Nxe4 Nxe4 is an even knight trade for black
+    score, _ = see("4k3/8/5n2/8/4N3/2N5/8/4K3 b - - 0 1", "f6e4")
+    assert score == 0
@@ -0,0 +1,78 @@
+"""Transposition table buckets and how the search trusts its entries."""
+from Engine.AI.minmax import MinMax
+from Engine.AI.transposition import TranspositionTable, EXACT, LOWER, UPPER
+from Engine.bitboard import start_position
+
+
+def bucket_keys(table, count):
+    """Distinct keys that all fall into bucket 5."""
+    return [5 + i * (table.mask + 1) for i in range(count)]
+
+
+def test_store_and_probe_round_trip():
+    table = TranspositionTable(1)
+    table.store(12345, 7, -250, UPPER, 0x1234)
+    assert table.probe(12345) == (7, -250, UPPER, 0x1234)
+    assert table.best_move(12345) == 0x1234
+    assert table.probe(54321) is None
+
+
+def test_depth_preferred_and_always_replace_slots():
+    table = TranspositionTable(1)
+    deep, shallow, newer, deeper = bucket_keys(table, 4)
+    table.store(deep, 5, 10, EXACT, 1)
+    table.store(shallow, 2, 20, EXACT, 2)
+    assert table.probe(deep)[0] == 5 and table.probe(shallow)[0] == 2
+
+    # Shallower than the depth-preferred entry: goes to the always-replace slot
+    table.store(newer, 3, 30, EXACT, 3)
+    assert table.probe(deep) is not None
+    assert table.probe(shallow) is None
+    assert table.probe(newer)[1] == 30
+
+    # At least as deep: takes over the depth-preferred slot
+    table.store(deeper, 6, 40, EXACT, 4)
+    assert table.probe(deep) is None
+    assert table.probe(deeper)[1] == 40
+    assert table.probe(newer)[1] == 30
+
+
+def test_same_position_keeps_its_best_move():
+    table = TranspositionTable(1)
+    table.store(99, 4, 0, EXACT, 77)
+    table.store(99, 1, 5, UPPER, 0)
+    assert table.probe(99) == (1, 5, UPPER, 77)
+
+
+def test_clear_and_hashfull():
+    table = TranspositionTable(1)
+    assert table.hashfull() == 0
+    buckets = table.mask + 1
+    for key in range(buckets):
+        table.store(key, 2, 0, EXACT, 0)
+        table.store(key + buckets, 1, 0, EXACT, 0)
+    assert table.hashfull() == 1000
+    table.clear()
+    assert table.probe(0) is None and table.hashfull() == 0
+
+
+def node_score(entry_depth, bound, score, alpha, beta, depth=2):
+    """Search the start position with one entry planted in the table for it."""
+    search = MinMax(None, None, depth, 1, randomize=False)
+    position = start_position()
+    search.tt.store(position.hash, entry_depth, score, bound, 0)
+    return search.best_move(position, depth, alpha, beta, True)
+
+
+def test_probe_result_used_only_when_deep_enough():
+    assert node_score(3, EXACT, 4321, -10 ** 6, 10 ** 6) == 4321
+    assert node_score(1, EXACT, 4321, -10 ** 6, 10 ** 6) != 4321
+
+
+def test_bounds_cut_off_only_outside_the_window():
+    # A lower bound at or above beta fails high; an upper bound at or below alpha fails low
+    assert node_score(3, LOWER, 500, -100, 100) == 500
+    assert node_score(3, UPPER, -500, -100, 100) == -500
+    # Bounds inside the window only narrow it; the node is still searched
+    assert node_score(3, LOWER, -4000, -5000, 5000) != -4000
+    assert node_score(3, UPPER, 4000, -5000, 5000) != 4000
@@ -0,0 +1,47 @@
+"""Scripted UCI sessions."""
+import io
+from Engine.engine import ChessEngine
+from Engine.uci import UCIProtocol
+
+
+def session(*commands):
+    """Run commands through a protocol handler, waiting for any search to finish."""
+    output = io.StringIO()
+    uci = UCIProtocol(output)
+    for command in commands:
+        assert uci.handle(command)
+        if uci.search_thread is not None:
+            uci.search_thread.join(30)
+            assert not uci.search_thread.is_alive()
+    return uci, output.getvalue().splitlines()
+
+
+def test_handshake_and_search():
+    uci, lines = session("uci", "isready", "position startpos moves e2e4", "go depth 2")
+    assert "uciok" in lines and "readyok" in lines
+    assert any(line.startswith("option name Hash") for line in lines)
+    assert any(line.startswith("info depth 2 ") for line in lines)
+
+    bestmove = [line for line in lines if line.startswith("bestmove")]
+    assert len(bestmove) == 1
+    reply = ChessEngine()
+    reply.make_move("e2e4")
+    reply.parse_move(bestmove[0].split()[1])  # raises if the move is illegal
+    assert uci.engine.fen() == reply.fen()
+    assert not uci.handle("quit")
+
+
+def test_hash_option_keeps_the_position():
+    uci, _ = session("position startpos moves e2e4 e7e5", "setoption name Hash value 2")
+    assert uci.engine.searcher.tt.size_mb == 2
+    expected = ChessEngine()
+    expected.make_move("e2e4")
+    expected.make_move("e7e5")
+    assert uci.engine.fen() == expected.fen()
+    assert len(uci.engine.moves) == 2
+
+
+def test_unknown_command_and_illegal_move():
+    uci, lines = session("xyzzy", "position startpos moves e2e5")
+    assert "info string Unknown command: xyzzy" in lines
+    assert "info string Illegal move: e2e5" in lines
@@ -0,0 +1,456 @@
+"""
+Pygame front-end for the chess engine.
+
+Everything that needs a display lives here, so the Engine package itself
+never imports pygame and can run headless.
+"""
+import pygame
+from Engine.chess import *
+from Engine.log import get_logger
+from Engine.bitboard import square
+from Engine.move import move_from, move_to, move_to_uci
+from Engine.AI.background import BackgroundSearch, PROGRESS, RESULT
+
+log = get_logger("ui")
+
+
+# Colours of the light and dark squares, the selected piece's square and its targets
+SQUARE_COLORS = [(255, 255, 255), (30, 0, 100)]
+SELECTED_COLOR = (255, 255, 0)
+TARGET_COLOR = (0, 255, 0)
+BACKGROUND_COLOR = (255, 255, 255)
+SPRITE_SIZE = 60
+SPRITE_OFFSET = 5
+# Screen areas redrawn only when their content changes
+CAPTURED_AREA = pygame.Rect(600, 650, 680, 70)
+STATUS_AREA = pygame.Rect(600, 550, 680, 100)
+
+# Frames per second while the AI is thinking
+FRAME_RATE = 60
+# Let the AI search the player's expected reply while the player thinks
+PONDER = True
+
+# Highlight states of a square
+NO_HIGHLIGHT, SELECTED, TARGET = range(3)
+
+
+class BoardRenderer:
+    """
+    Draws a Chessboard onto a pygame surface.
+
+    Piece sprites are loaded from disk once into a single atlas surface and
+    the empty board is pre-rendered, so a frame only blits. Each render
+    redraws just the squares whose piece or highlight changed since the
+    last one and returns their rectangles for pygame.display.update.
+    """
+    def __init__(self, board, cell_size=75):
+        """
+        Initialize the renderer.
+
+        Args:
+            board (Chessboard): The board to draw.
+            cell_size (int): Size of one square in pixels.
+        """
+        self.ChessBoard = board
+        self.cell_size = cell_size
+        self.sprites = None
+        self.background = None
+        # What each square (x * 8 + y) currently shows on screen
+        self.drawn = [None] * 64
+        self.captured_drawn = None
+        self.full_redraw = True
+
+    def loadSprites(self):
+        """Load every piece sprite once into one atlas surface."""
+        types = list(ChessPieceSprites)
+        self.atlas = pygame.Surface((SPRITE_SIZE * len(types), SPRITE_SIZE * 2),
+                                    pygame.SRCALPHA).convert_alpha()
+        self.atlas.fill((0, 0, 0, 0))
+        self.sprites = {}
+        for column, pieceType in enumerate(types):
+            for row, color in enumerate(("white", "black")):
+                image = pygame.image.load(ChessPieceSprites[pieceType] + "_" + color + ".png")
+                area = pygame.Rect(column * SPRITE_SIZE, row * SPRITE_SIZE, SPRITE_SIZE, SPRITE_SIZE)
+                self.atlas.blit(image, area)
+                self.sprites[pieceType, color] = self.atlas.subsurface(area)
+
+    def buildBackground(self):
+        """Pre-render the empty board."""
+        cell_size = self.cell_size
+        self.background = pygame.Surface((cell_size * 8, cell_size * 8)).convert()
+        for x in range(8):
+            for y in range(8):
+                rect = pygame.Rect(x * cell_size, y * cell_size, cell_size, cell_size)
+                self.background.fill(SQUARE_COLORS[(x + y) % 2], rect)
+
+    def invalidate(self):
+        """Redraw the whole screen on the next render, e.g. after something else drew over it."""
+        self.full_redraw = True
+
+    def render(self, screen, selected=None, targets=()):
+        """
+        Render the chessboard and pieces on the screen.
+
+        Args:
+            screen (pygame.Surface): The screen to render on.
+            selected (tuple): (x, y) of the selected piece to highlight, if any.
+            targets (list): (x, y) squares the selected piece can move to.
+
+        Returns:
+            list: The rectangles of the screen that changed.
+        """
+        if self.sprites is None:
+            self.loadSprites()
+            self.buildBackground()
+
+        dirty = []
+        if self.full_redraw:
+            screen.fill(BACKGROUND_COLOR)
+            screen.blit(self.background, (0, 0))
+            self.drawn = [None] * 64
+            self.captured_drawn = None
+            self.full_redraw = False
+            dirty.append(screen.get_rect())
+
+        cell_size = self.cell_size
+        board = self.ChessBoard.board
+        for x in range(8):
+            for y in range(8):
+                piece = board[x, y]
+                if (x, y) == selected:
+                    highlight = SELECTED
+                elif (x, y) in targets:
+                    highlight = TARGET
+                else:
+                    highlight = NO_HIGHLIGHT
+                state = (piece.ID, piece.color, highlight) if piece else (None, None, highlight)
+                if self.drawn[x * 8 + y] == state:
+                    continue
+                self.drawn[x * 8 + y] = state
+
+                rect = pygame.Rect(x * cell_size, y * cell_size, cell_size, cell_size)
+                if highlight == SELECTED:
+                    screen.fill(SELECTED_COLOR, rect)
+                elif highlight == TARGET:
+                    screen.fill(TARGET_COLOR, rect)
+                else:
+                    screen.blit(self.background, rect, rect)
+                if piece:
+                    screen.blit(self.sprites[piece.ID, piece.color],
+                                (rect.x + SPRITE_OFFSET, rect.y + SPRITE_OFFSET))
+                dirty.append(rect)
+        return dirty
+
+    def renderCapturedPieces(self, screen):
+        """
+        Render the captured pieces on the screen if they changed.
+
+        Args:
+            screen (pygame.Surface): The screen to render on.
+
+        Returns:
+            list: The rectangles of the screen that changed.
+        """
+        captured = tuple((piece.ID, piece.color) for piece in self.ChessBoard.captured)
+        if captured == self.captured_drawn:
+            return []
+        self.captured_drawn = captured
+
+        screen.fill(BACKGROUND_COLOR, CAPTURED_AREA)
+        white_captured = [pieceType for pieceType, color in captured if color == "white"]
+        black_captured = [pieceType for pieceType, color in captured if color == "black"]
+
+        # Render white captured pieces
+        for i, pieceType in enumerate(white_captured):
+            screen.blit(self.sprites[pieceType, "white"], (600 + i * 40, 650))
+
+        # Render black captured pieces
+        for i, pieceType in enumerate(black_captured):
+            screen.blit(self.sprites[pieceType, "black"], (600 + i * 40, 700))
+        return [CAPTURED_AREA]
+
+
+class GameUI(Game):
+    """
+    A Game played against the AI in a pygame window.
+
+    The loop is event driven: while the player thinks it sleeps until the
+    next event, and while the AI thinks its search runs on a worker thread
+    and the loop keeps drawing at FRAME_RATE, polling for the result. Space
+    makes the AI move at once with its best move so far and R resigns.
+
+    With PONDER on, the AI spends the player's thinking time searching the
+    position after the reply its principal variation predicts. If the
+    player makes that move the search simply carries on against the clock;
+    otherwise it is cancelled and a new one starts, still with the
+    transposition table entries the pondering filled in.
+    """
+    def __init__(self, screen, clock, font, color="white"):
+        """
+        Initialize the game window.
+
+        Args:
+            screen (pygame.Surface): The screen to render the game on.
+            clock (pygame.time.Clock): The game clock.
+            font (pygame.font.Font): The font for rendering text.
+            color (str): The player's color ('white' or 'black').
+        """
+        super().__init__(color)
+        self.screen = screen
+        self.clock = clock
+        self.font = font
+        self.renderer = BoardRenderer(self.ChessBoard)
+        self.status_drawn = None
+        self.search = BackgroundSearch(self.AI)
+        # The player's legal moves, their selected piece and the squares it can move to
+        self.legalMoves = []
+        self.selected = None
+        self.targets = []
+        # Progress of the AI's search, shown next to the side to move
+        self.thinking = None
+        # The player's move being pondered, and whether the player made it
+        self.ponder_move = None
+        self.ponder_continues = False
+        # The move the search posted, held until it is the AI's turn and pondering is over
+        self.pending_move = None
+
+    def side(self):
+        """The side to move ('white' or 'black')."""
+        return "white" if self.turn == 0 else "black"
+
+    def PlayGame(self):
+        """Run the main game loop."""
+        self.beginTurn()
+        while not self.endGame:
+            if self.turn == 1:
+                # The AI's move arrives through the search's queue, not as an event
+                events = pygame.event.get()
+            else:
+                # Nothing changes until the player does something
+                events = [pygame.event.wait()] + pygame.event.get()
+            for event in events:
+                self.handleEvent(event)
+                if self.endGame:
+                    break
+            else:
+                self.pollSearch()
+
+            self.redraw(self.side(), self.selected, self.targets)
+            self.clock.tick(FRAME_RATE)
+
+        self.search.cancel()
+        self.close()
+        if self.winner is None:
+            self.DeclareWinner()
+        pygame.quit()
+
+    def beginTurn(self):
+        """Check the game state for the side to move and start the AI if it is its turn."""
+        res = self.CheckWinningConditions()
+        side = self.side()
+
+        if res in ["Checkmate", "Stalemate"]:
+            if res == "Checkmate":
+                print(f"{side} wins!")
+            else:
+                print("Stalemate! It's a draw!")
+            self.endGame = True
+            return
+        elif res == "Check":
+            print("Check")
+
+        if self.turn == 0:
+            self.legalMoves = self.LegalMoves(side)
+            if self.ponder_move is not None:
+                self.startPonder()
+        elif self.ponder_continues:
+            # The search of this position is already running
+            self.ponder_continues = False
+            self.thinking = "ponder hit"
+        else:
+            position, legal_moves = self.AI.root_position(side)
+            if not legal_moves:
+                log.warning("No legal moves available for %s", side)
+                self.endGame = True
+                return
+            self.thinking = "thinking"
+            self.pending_move = None
+            self.search.start(position, legal_moves)
+
+    def endTurn(self):
+        """Score the move just played and pass the turn."""
+        self.score = self.ChessBoard.evaluate()
+        self.turn = 1 - self.turn
+        self.selected = None
+        self.targets = []
+        self.thinking = None
+        self.beginTurn()
+
+    def pollSearch(self):
+        """
+        Show the AI's progress and play its move once the search posts it.
+
+        A move is only played on the AI's turn from a search that is no
+        longer pondering; until then checkPonder decides whether it counts.
+        """
+        for kind, value in self.search.poll():
+            if kind == PROGRESS:
+                depth, move = value[:2]
+                self.thinking = f"depth {depth}: {move_to_uci(move)}"
+            elif kind == RESULT:
+                self.pending_move = value
+
+        if self.pending_move is None or self.turn != 1 or self.AI.pondering:
+            return
+        value, self.pending_move = self.pending_move, None
+        # The principal variation starts with this move; its next one is the expected reply
+        pv = self.AI.pv
+        self.ponder_move = pv[1] if PONDER and len(pv) > 1 and pv[0] == value else None
+        piece, move = self.AI.to_board_move(value)
+        piece.move(move)
+        self.endTurn()
+
+    def startPonder(self):
+        """Search the position after the player's expected reply in the background."""
+        position, legal_moves = self.AI.root_position(self.side())
+        if self.ponder_move not in legal_moves:
+            self.ponder_move = None
+            return
+        position.make_move(self.ponder_move)
+        reply_moves = self.AI.board_moves(position)
+        if not reply_moves:
+            self.ponder_move = None
+            return
+        log.debug("Pondering on %s", move_to_uci(self.ponder_move))
+        self.pending_move = None
+        self.search.start(position, reply_moves, ponder=True)
+
+    def checkPonder(self, fromSquare, toSquare):
+        """
+        Keep the pondering search if the player made the expected move, otherwise cancel it.
+
+        Args:
+            fromSquare (int): The square the player moved from.
+            toSquare (int): The square the player moved to.
+        """
+        move = self.ponder_move
+        self.ponder_move = None
+        if move is None:
+            return
+        if move_from(move) == fromSquare and move_to(move) == toSquare:
+            log.info("Ponder hit on %s", move_to_uci(move))
+            self.search.ponder_hit()
+            self.ponder_continues = True
+        else:
+            log.info("Ponder miss: expected %s", move_to_uci(move))
+            self.search.cancel()
+            self.pending_move = None
+
+    def handleEvent(self, event):
+        """
+        Handle one pygame event.
+
+        Args:
+            event (pygame.event.Event): The event.
+        """
+        if event.type == pygame.QUIT:
+            self.endGame = True
+
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_SPACE and self.turn == 1 and self.search.running():
+                # Play the best move found so far
+                self.search.stop()
+            elif event.key == pygame.K_r:
+                self.resign(self.color)
+
+        elif event.type == pygame.MOUSEBUTTONDOWN and self.turn == 0:
+            cell_size = self.renderer.cell_size
+            x = (event.pos[0] // cell_size) % 8
+            y = (event.pos[1] // cell_size) % 8
+            log.debug("Clicked on %s, %s", x, y)
+            self.selectSquare(x, y)
+
+    def resign(self, side):
+        """
+        End the game with one side resigning, abandoning any search in progress.
+
+        Args:
+            side (str): The side that resigns.
+        """
+        self.search.cancel()
+        print(f"{side} resigns!")
+        self.winner = "Black" if side == "white" else "White"
+        self.endGame = True
+
+    def selectSquare(self, x, y):
+        """
+        Handle the player clicking a square: select one of their pieces or move the selected one.
+
+        Args:
+            x (int): The clicked file.
+            y (int): The clicked rank.
+        """
+        side = self.side()
+        piece = self.ChessBoard.board[x, y]
+        if piece is not None and piece.color == side:
+            self.selected = (x, y)
+            self.targets = [move for movePiece, move in self.legalMoves if movePiece is piece]
+            log.debug("Valid moves: %s", self.targets)
+            return
+
+        if self.selected is None:
+            return
+        if (x, y) not in self.targets:
+            log.debug("Invalid move")
+            self.selected = None
+            self.targets = []
+            return
+
+        # Only legal moves are offered, so the move cannot leave the king in check
+        fromX, fromY = self.selected
+        self.ChessBoard.board[fromX, fromY].move((x, y))
+        log.debug("Valid move made")
+        self.checkPonder(square(fromX, fromY), square(x, y))
+        self.endTurn()
+
+    def renderStatus(self, side):
+        """
+        Render the score and the side to move if they changed.
+
+        Args:
+            side (str): The side to move.
+
+        Returns:
+            list: The rectangles of the screen that changed.
+        """
+        status = (self.score, side, self.thinking)
+        if status == self.status_drawn:
+            return []
+        self.status_drawn = status
+        self.screen.fill(BACKGROUND_COLOR, STATUS_AREA)
+
+        score_text_surface = self.font.render(f"Current Score: {self.score}", True, (0, 0, 0))
+        self.screen.blit(score_text_surface, (600, 550))
+
+        turn_text = f"{side}'s turn" if self.thinking is None else f"{side}'s turn ({self.thinking})"
+        side_text_surface = self.font.render(turn_text, True, (0, 0, 0))
+        self.screen.blit(side_text_surface, (600, 600))
+        return [STATUS_AREA]
+
+    def redraw(self, side, selected=None, targets=()):
+        """
+        Bring the window up to date, pushing only the changed areas to the display.
+
+        Args:
+            side (str): The side to move.
+            selected (tuple): (x, y) of the selected piece, if any.
+            targets (list): (x, y) squares the selected piece can move to.
+        """
+        full_redraw = self.renderer.full_redraw
+        dirty = self.renderer.render(self.screen, selected, targets)
+        dirty += self.renderer.renderCapturedPieces(self.screen)
+        if full_redraw:
+            self.status_drawn = None
+        dirty += self.renderStatus(side)
+        if dirty:
+            pygame.display.update(dirty)